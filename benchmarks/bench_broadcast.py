@@ -0,0 +1,109 @@
+"""
+Presence broadcast benchmark.
+
+Registers N simulated WebSocket clients with the presence server and times
+how long one delta takes to reach all of them through server.fan_out() and
+the per-client send tasks. A quarter of the clients use the binary encoding,
+so both serialisation paths are exercised.
+"""
+
+import asyncio
+import gc
+import time
+
+from harness import require, summarize
+
+CLIENT_COUNTS = (1, 10, 100, 500)
+
+
+class SimulatedWebSocket:
+    """Stands in for a connected client; counts messages as they are sent."""
+
+    def __init__(self, on_message):
+        self._on_message = on_message
+
+    async def send_text(self, message: str):
+        self._on_message()
+
+    async def send_bytes(self, message: bytes):
+        self._on_message()
+
+    async def close(self):
+        pass
+
+
+async def _bench_clients(server, client_count: int, rounds: int) -> dict:
+    from clients import ClientSender
+    from protocol import BINARY, JSON
+
+    delivered = 0
+    all_delivered = asyncio.Event()
+
+    def on_message():
+        nonlocal delivered
+        delivered += 1
+        if delivered >= client_count:
+            all_delivered.set()
+
+    server.connected_clients.clear()
+    for index in range(client_count):
+        websocket = SimulatedWebSocket(on_message)
+        sender = ClientSender(
+            websocket,
+            server.status_message,
+            encoding=BINARY if index % 4 == 0 else JSON,
+        )
+        sender.start()
+        server.connected_clients[websocket] = sender
+
+    status = server.detector.get_status()
+    samples = []
+    gc.collect()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    try:
+        for round_index in range(rounds):
+            delivered = 0
+            all_delivered.clear()
+            status["present"] = round_index % 2 == 0
+            fields = {"present": status["present"], "last_update": None}
+
+            start = time.perf_counter()
+            server.fan_out("delta", status, fields)
+            await all_delivered.wait()
+            samples.append(time.perf_counter() - start)
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        for sender in list(server.connected_clients.values()):
+            await sender.stop()
+        server.connected_clients.clear()
+
+    return summarize(samples, wall, cpu, items=client_count)
+
+
+def bench_broadcast(rounds: int = 200) -> dict:
+    """
+    Benchmark delta fan-out to simulated clients.
+
+    Args:
+        rounds: Deltas broadcast per client count
+
+    Returns:
+        Dictionary of "clients=<N>" to result records (per_second counts
+        delivered messages; latency is until the last client has its copy)
+    """
+    require("fastapi", "loguru")
+    import server
+    from detector import FaceDetector
+
+    # An unstarted detector is enough for status snapshots
+    server.detector = FaceDetector()
+
+    async def run():
+        return {
+            f"clients={count}": await _bench_clients(server, count, rounds)
+            for count in CLIENT_COUNTS
+        }
+
+    return asyncio.run(run())
@@ -0,0 +1,88 @@
+"""
+Face detection benchmarks.
+
+- detector: the presence service's FaceDetector._detect_faces at several
+  resolutions, on synthetic frames and on the bundled photos
+- cascade_params: the Haar parameter matrix (scaleFactor, minNeighbors,
+  minSize) at VGA, with the number of faces found in the photos as a rough
+  recall check next to the cost
+"""
+
+import itertools
+
+from harness import RESOLUTIONS, measure, photo_frames, require, synthetic_frame
+
+SCALE_FACTORS = (1.05, 1.1, 1.2, 1.3)
+MIN_NEIGHBORS = (3, 5, 7)
+MIN_SIZES = ((30, 30), (60, 60))
+
+
+def bench_detector(backends=("haar",), iterations: int = 30) -> dict:
+    """
+    Benchmark FaceDetector._detect_faces per backend and resolution.
+
+    Args:
+        backends: Detection backend names to run
+        iterations: Timed detections per case
+
+    Returns:
+        Dictionary of "<backend>/<resolution>/<input>" to result records
+    """
+    require("cv2", "numpy")
+    from detector import FaceDetector
+
+    results = {}
+    for backend in backends:
+        detector = FaceDetector(backend=backend)
+        try:
+            detector.load_pipeline()
+        except (RuntimeError, ValueError) as e:
+            results[backend] = {"skipped": str(e)}
+            continue
+
+        for resolution, (width, height) in RESOLUTIONS.items():
+            frame = synthetic_frame(width, height)
+            results[f"{backend}/{resolution}/synthetic"] = measure(
+                lambda: detector._detect_faces(frame), iterations
+            )
+
+            photos = list(photo_frames(width, height).values())
+            if photos:
+                cycle = itertools.cycle(photos)
+                results[f"{backend}/{resolution}/photos"] = measure(
+                    lambda: detector._detect_faces(next(cycle)), iterations
+                )
+    return results
+
+
+def bench_cascade_params(iterations: int = 15) -> dict:
+    """
+    Benchmark the Haar cascade parameter matrix on VGA frames.
+
+    Args:
+        iterations: Timed detections per parameter combination
+
+    Returns:
+        Dictionary of "sf=<>/mn=<>/ms=<>" to result records, each with the
+        total faces found across the bundled photos
+    """
+    require("cv2", "numpy")
+    from facedetect import HaarBackend
+
+    width, height = RESOLUTIONS["vga"]
+    photos = list(photo_frames(width, height).values())
+    frames = photos or [synthetic_frame(width, height)]
+
+    results = {}
+    for scale_factor, min_neighbors, min_size in itertools.product(
+        SCALE_FACTORS, MIN_NEIGHBORS, MIN_SIZES
+    ):
+        backend = HaarBackend(
+            scale_factor=scale_factor, min_neighbors=min_neighbors, min_size=min_size
+        )
+        cycle = itertools.cycle(frames)
+        record = measure(lambda: backend.detect(next(cycle)), iterations)
+        record["faces_in_photos"] = sum(len(backend.detect(photo)) for photo in photos)
+        key = f"sf={scale_factor}/mn={min_neighbors}/ms={min_size[0]}"
+        results[key] = record
+    return results
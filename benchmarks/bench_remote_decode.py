@@ -0,0 +1,65 @@
+"""
+Remote presence decode benchmark.
+
+Times RemotePresenceProcessor._detect_faces on InputImageRawFrames carrying
+the same VGA image as JPEG bytes and as raw RGB, RGBA, I420 and BGR pixels, so the
+cost of each decode path can be compared against the detection itself.
+"""
+
+from harness import RESOLUTIONS, measure, photo_frames, require, synthetic_frame
+
+
+def _raw_frames(image) -> dict:
+    """Build an InputImageRawFrame per input format from one BGR image."""
+    import cv2
+    from pipecat.frames.frames import InputImageRawFrame
+
+    height, width = image.shape[:2]
+    size = (width, height)
+    ok, jpeg = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    if not ok:
+        raise RuntimeError("Failed to encode JPEG test frame")
+
+    return {
+        "jpeg": InputImageRawFrame(image=jpeg.tobytes(), size=size, format="JPEG"),
+        "rgb": InputImageRawFrame(
+            image=cv2.cvtColor(image, cv2.COLOR_BGR2RGB).tobytes(),
+            size=size,
+            format="RGB",
+        ),
+        "rgba": InputImageRawFrame(
+            image=cv2.cvtColor(image, cv2.COLOR_BGR2RGBA).tobytes(),
+            size=size,
+            format="RGBA",
+        ),
+        "i420": InputImageRawFrame(
+            image=cv2.cvtColor(image, cv2.COLOR_BGR2YUV_I420).tobytes(),
+            size=size,
+            format="I420",
+        ),
+        "bgr": InputImageRawFrame(image=image.tobytes(), size=size, format=None),
+    }
+
+
+def bench_remote_decode(iterations: int = 30) -> dict:
+    """
+    Benchmark the remote processor's decode-and-detect path per input format.
+
+    Args:
+        iterations: Timed frames per format
+
+    Returns:
+        Dictionary of input format to result records
+    """
+    require("cv2", "numpy", "pipecat")
+    from processors.remote_presence_processor import RemotePresenceProcessor
+
+    width, height = RESOLUTIONS["vga"]
+    photos = list(photo_frames(width, height).values())
+    image = photos[0] if photos else synthetic_frame(width, height)
+
+    processor = RemotePresenceProcessor()
+    return {
+        name: measure(lambda: processor._detect_faces(frame), iterations)
+        for name, frame in _raw_frames(image).items()
+    }
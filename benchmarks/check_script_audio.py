@@ -0,0 +1,139 @@
+"""
+Check that pre-synthesised script lines are played once, not spoken again by TTS.
+
+A ScriptProcessor with one cached and one uncached line runs in a pipeline
+in front of an LLM service (which stamps its own skip_tts on the response
+frames it passes on, as the bot's GoogleLLMService does) and a
+CachingTTSService speaking through a counting local_stream stand-in. The
+cached line must reach the output as its cached audio only, without calling
+the TTS stream; the uncached line must still be synthesised. No network or
+API key is involved.
+
+Usage:
+    python benchmarks/check_script_audio.py
+
+The exit status is 1 if any check fails.
+"""
+
+import asyncio
+import sys
+import tempfile
+
+from harness import Skipped, require
+
+SAMPLE_RATE = 16000
+CACHED_LINE = "OK, let's go!"
+UNCACHED_LINE = "Hey! You're the only one here with hands."
+
+
+async def check_script_audio() -> list[str]:
+    """
+    Run two script lines through an LLM service and the caching TTS.
+
+    Returns:
+        Descriptions of the checks that failed
+    """
+    from pipecat.frames.frames import EndFrame, Frame, LLMContextFrame, TTSAudioRawFrame
+    from pipecat.pipeline.pipeline import Pipeline
+    from pipecat.pipeline.runner import PipelineRunner
+    from pipecat.pipeline.task import PipelineParams, PipelineTask
+    from pipecat.processors.aggregators.llm_context import LLMContext
+    from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+    from pipecat.services.llm_service import LLMService
+    from processors.audio_cache import AudioCache, local_stream
+    from processors.caching_tts import CachingTTSService
+    from processors.script_processor import ScriptProcessor
+
+    failures = []
+
+    def expect(condition: bool, description: str):
+        print(f"{'ok' if condition else 'FAIL'} {description}", file=sys.stderr)
+        if not condition:
+            failures.append(description)
+
+    class PassThroughLLM(LLMService):
+        """Answers nothing itself; passes frames on like the bot's LLM does."""
+
+        async def process_frame(self, frame: Frame, direction: FrameDirection):
+            await super().process_frame(frame, direction)
+            await self.push_frame(frame, direction)
+
+    class AudioRecorder(FrameProcessor):
+        """Collects the audio that would reach the transport."""
+
+        def __init__(self):
+            super().__init__()
+            self.audio = b""
+
+        async def process_frame(self, frame: Frame, direction: FrameDirection):
+            await super().process_frame(frame, direction)
+            if isinstance(frame, TTSAudioRawFrame):
+                self.audio += frame.audio
+            await self.push_frame(frame, direction)
+
+    calls = []
+    speak = local_stream()
+
+    async def counting_stream(text, voice_id, sample_rate, session=None):
+        calls.append(text)
+        async for chunk in speak(text, voice_id, sample_rate):
+            yield chunk
+
+    line_audio = b"\x01\x00" * SAMPLE_RATE
+    script_cache = AudioCache(tempfile.mkdtemp(prefix="script-audio-"))
+    script_cache.put(CACHED_LINE, "voice", SAMPLE_RATE, line_audio)
+
+    recorder = AudioRecorder()
+    pipeline = Pipeline(
+        [
+            ScriptProcessor(
+                [CACHED_LINE, UNCACHED_LINE], audio_cache=script_cache, voice_id="voice"
+            ),
+            PassThroughLLM(),
+            CachingTTSService(
+                stream=counting_stream,
+                cache=AudioCache(tempfile.mkdtemp(prefix="tts-cache-")),
+                voice_id="voice",
+                sample_rate=SAMPLE_RATE,
+                # Speak each text frame as is; sentence splitting needs NLTK data
+                aggregate_sentences=False,
+            ),
+            recorder,
+        ]
+    )
+    task = PipelineTask(
+        pipeline,
+        params=PipelineParams(audio_out_sample_rate=SAMPLE_RATE),
+        cancel_on_idle_timeout=False,
+    )
+
+    async def speak_script():
+        # Let the script load its cached audio before the first turn
+        await asyncio.sleep(0.2)
+        await task.queue_frames(
+            [LLMContextFrame(LLMContext()), LLMContextFrame(LLMContext()), EndFrame()]
+        )
+
+    await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), speak_script())
+    expect(CACHED_LINE not in calls, "cached line does not call the TTS stream")
+    expect(calls == [UNCACHED_LINE], "uncached line is synthesised by the TTS")
+    expect(recorder.audio.count(line_audio) == 1, "cached line's audio is played once")
+    return failures
+
+
+def main():
+    try:
+        require("pipecat", "aiohttp")
+        failures = asyncio.run(check_script_audio())
+    except Skipped as e:
+        print(f"Skipped: {e}", file=sys.stderr)
+        return 0
+
+    if failures:
+        return 1
+    print("Script audio checks passed.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Check that FaceTracker reports the backend's faces while scanning less.
+
+Each bundled photo, at its own size and at the benchmark resolutions, is fed
+to a tracker as a still video for a number of frames. Every face the tracker
+reports must overlap one from a plain backend scan of the same image, and
+every backend face that also shows up on the tracker's downscaled newcomer
+scan must be reported. Backend faces the downscaled scan cannot see may
+legitimately be missed. Each photo must also take fewer full-resolution
+scans than frames; the scan counts show how the work was split.
+
+Usage:
+    python benchmarks/check_tracking.py
+    python benchmarks/check_tracking.py --profiles default pi --frames 20
+
+The exit status is 1 if any frame disagrees or every frame needed a full scan.
+"""
+
+import argparse
+import sys
+
+from harness import PHOTOS_DIR, RESOLUTIONS, Skipped, photo_frames, require
+
+
+def overlap(a, b) -> float:
+    """Intersection over union of two face boxes."""
+    width = min(a.x + a.w, b.x + b.w) - max(a.x, b.x)
+    height = min(a.y + a.h, b.y + b.h) - max(a.y, b.y)
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    return intersection / (a.w * a.h + b.w * b.h - intersection)
+
+
+def agrees(found: list, expected: list, required: list, min_overlap: float = 0.5) -> bool:
+    """
+    Whether found pairs up with expected faces, covering every required one.
+
+    Each found box must overlap a distinct expected box, and each required box
+    (a subset of expected) must be overlapped by one of the found boxes.
+    """
+    unmatched = list(expected)
+    for face in found:
+        match = next((e for e in unmatched if overlap(face, e) >= min_overlap), None)
+        if match is None:
+            return False
+        unmatched.remove(match)
+    return not any(face in unmatched for face in required)
+
+
+def contains_center(box, face) -> bool:
+    """Whether face's center lies inside box."""
+    cx, cy = face.x + face.w / 2, face.y + face.h / 2
+    return box.x <= cx <= box.x + box.w and box.y <= cy <= box.y + box.h
+
+
+def check_tracking(backend_name: str, profiles, frames: int) -> list[str]:
+    """
+    Run the tracker against the backend on every photo, size and profile.
+
+    Args:
+        backend_name: Detection backend to wrap
+        profiles: Cascade parameter profiles to check
+        frames: Frames to track per photo
+
+    Returns:
+        Human-readable descriptions of the frames that disagreed and of the
+        photos that took a full scan on every frame
+    """
+    require("cv2", "numpy")
+    import cv2
+    from facedetect import Face, FaceTracker, create_backend
+
+    images = {
+        f"{path.stem}@native": cv2.imread(str(path))
+        for path in sorted(PHOTOS_DIR.glob("*.jpeg"))
+    }
+    for resolution, (width, height) in RESOLUTIONS.items():
+        for name, frame in photo_frames(width, height).items():
+            images[f"{name}@{resolution}"] = frame
+
+    mismatches = []
+    for profile in profiles:
+        backend = create_backend(backend_name, profile=profile)
+        for name, frame in images.items():
+            expected = backend.detect(frame)
+            tracker = FaceTracker(backend)
+            # The faces the tracker's newcomer scan can see, in frame pixels
+            scale = min(1.0, tracker.coarse_scan_width / frame.shape[1])
+            small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            coarse = [
+                Face(int(f.x / scale), int(f.y / scale), int(f.w / scale), int(f.h / scale))
+                for f in backend.detect(small)
+            ]
+            required = [e for e in expected if any(contains_center(e, c) for c in coarse)]
+
+            for index in range(frames):
+                found = tracker.detect(frame)
+                if not agrees(found, expected, required):
+                    mismatches.append(
+                        f"{profile}/{name} frame {index}: tracker {found}, "
+                        f"backend {expected}, required {required}"
+                    )
+            stats = tracker.stats()
+            if stats["full_scans"] >= frames:
+                mismatches.append(
+                    f"{profile}/{name}: {stats['full_scans']} full scans in {frames} frames"
+                )
+            print(
+                f"{profile}/{name}: {len(expected)} faces ({len(required)} coarse), "
+                f"{stats['roi_scans']} region, {stats['coarse_scans']} coarse, "
+                f"{stats['full_scans']} full scans",
+                file=sys.stderr,
+            )
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check FaceTracker against its backend")
+    parser.add_argument("--backend", default="haar")
+    parser.add_argument("--profiles", nargs="+", default=["default", "pi", "accurate"])
+    parser.add_argument(
+        "--frames", type=int, default=12, help="Frames tracked per photo (default: 12)"
+    )
+    args = parser.parse_args()
+
+    try:
+        mismatches = check_tracking(args.backend, args.profiles, args.frames)
+    except Skipped as e:
+        print(f"Skipped: {e}", file=sys.stderr)
+        return 0
+
+    for mismatch in mismatches:
+        print(f"MISMATCH {mismatch}")
+    if mismatches:
+        return 1
+    print("Tracker and backend agree on every frame.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Check the bot's TTS cache offline: hits, misses and least-recently-used eviction.
+
+AudioCache is filled past a small cap to check eviction order, recency
+updates and reloading from disk. CachingTTSService then speaks through the
+offline local_stream stand-in, counting how often the stream is called, to
+check that repeated phrases (up to whitespace) are served from the cache and
+that failed syntheses are not cached. No network or API key is involved.
+
+Usage:
+    python benchmarks/check_tts_cache.py
+
+The exit status is 1 if any check fails.
+"""
+
+import asyncio
+import sys
+import tempfile
+
+from harness import Skipped, require
+
+SAMPLE_RATE = 16000
+
+
+def check_audio_cache() -> list[str]:
+    """
+    Check AudioCache lookups, eviction order and reloading.
+
+    Returns:
+        Descriptions of the checks that failed
+    """
+    from processors.audio_cache import AudioCache
+
+    failures = []
+
+    def expect(condition: bool, description: str):
+        print(f"{'ok' if condition else 'FAIL'} {description}", file=sys.stderr)
+        if not condition:
+            failures.append(description)
+
+    directory = tempfile.mkdtemp(prefix="tts-cache-")
+    cache = AudioCache(directory, max_bytes=250)
+    expect(cache.get("one", "voice", SAMPLE_RATE) is None, "empty cache misses")
+
+    for name in ("one", "two"):
+        cache.put(name, "voice", SAMPLE_RATE, b"\0" * 100)
+    expect(cache.get("one", "voice", SAMPLE_RATE) is not None, "stored phrase hits")
+    expect(
+        cache.get("  one ", "voice", SAMPLE_RATE) is not None,
+        "whitespace variants share an entry",
+    )
+    expect(cache.get("one", "other", SAMPLE_RATE) is None, "other voices miss")
+    expect(cache.get("one", "voice", 24000) is None, "other sample rates miss")
+
+    # "one" was just used, so "two" is the least recently used entry
+    cache.put("three", "voice", SAMPLE_RATE, b"\0" * 100)
+    expect(len(cache) == 2 and cache.size == 200, "cap holds two entries")
+    expect(cache.get("two", "voice", SAMPLE_RATE) is None, "least recently used evicted")
+    expect(cache.get("one", "voice", SAMPLE_RATE) is not None, "recently used kept")
+
+    reloaded = AudioCache(directory, max_bytes=250)
+    expect(
+        len(reloaded) == 2 and reloaded.get("three", "voice", SAMPLE_RATE) is not None,
+        "entries survive a reload",
+    )
+    return failures
+
+
+async def check_caching_tts() -> list[str]:
+    """
+    Check CachingTTSService hits and misses against a counting local stream.
+
+    Returns:
+        Descriptions of the checks that failed
+    """
+    from pipecat.frames.frames import ErrorFrame, TTSAudioRawFrame
+    from processors.audio_cache import AudioCache, local_stream
+    from processors.caching_tts import CachingTTSService
+
+    failures = []
+
+    def expect(condition: bool, description: str):
+        print(f"{'ok' if condition else 'FAIL'} {description}", file=sys.stderr)
+        if not condition:
+            failures.append(description)
+
+    calls = []
+    speak = local_stream()
+
+    async def counting_stream(text, voice_id, sample_rate, session=None):
+        calls.append(text)
+        async for chunk in speak(text, voice_id, sample_rate):
+            yield chunk
+
+    async def failing_stream(text, voice_id, sample_rate, session=None):
+        calls.append(text)
+        yield b"\0\0"
+        raise RuntimeError("synthesis failed")
+
+    async def audio(tts, text) -> tuple[bytes, bool]:
+        frames = [frame async for frame in tts.run_tts(text)]
+        spoken = b"".join(f.audio for f in frames if isinstance(f, TTSAudioRawFrame))
+        return spoken, any(isinstance(f, ErrorFrame) for f in frames)
+
+    cache = AudioCache(tempfile.mkdtemp(prefix="tts-cache-"))
+    tts = CachingTTSService(
+        stream=counting_stream, cache=cache, voice_id="voice", sample_rate=SAMPLE_RATE
+    )
+    # Normally set from the pipeline's StartFrame
+    tts._sample_rate = SAMPLE_RATE
+
+    first, _ = await audio(tts, "I hear you loud and clear.")
+    expect(calls == ["I hear you loud and clear."] and first, "miss calls the stream")
+    again, _ = await audio(tts, "I hear you  loud and clear.")
+    expect(len(calls) == 1 and again == first, "repeat is served from the cache")
+    await audio(tts, "Something new.")
+    expect(len(calls) == 2 and len(cache) == 2, "new phrase is synthesised and cached")
+
+    calls.clear()
+    failing = CachingTTSService(
+        stream=failing_stream,
+        cache=AudioCache(tempfile.mkdtemp(prefix="tts-cache-")),
+        voice_id="voice",
+        sample_rate=SAMPLE_RATE,
+    )
+    failing._sample_rate = SAMPLE_RATE
+    _, errored = await audio(failing, "Broken.")
+    await audio(failing, "Broken.")
+    expect(errored and len(calls) == 2, "failed synthesis is not cached")
+    return failures
+
+
+def main():
+    try:
+        require("pipecat", "aiohttp")
+        failures = check_audio_cache() + asyncio.run(check_caching_tts())
+    except Skipped as e:
+        print(f"Skipped: {e}", file=sys.stderr)
+        return 0
+
+    if failures:
+        return 1
+    print("TTS cache checks passed.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Shared helpers for the benchmark suite: timing, memory, test frames and
+result files.
+
+Everything runs offline: frames are either synthetic or built from the
+bundled photos in ../photos.
+"""
+
+import gc
+import json
+import platform
+import resource
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PHOTOS_DIR = REPO_ROOT / "photos"
+
+# Make the shared package and both services importable
+for path in (REPO_ROOT, REPO_ROOT / "presence", REPO_ROOT / "bot"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+RESOLUTIONS = {
+    "qvga": (320, 240),
+    "vga": (640, 480),
+    "hd": (1280, 720),
+}
+
+
+class Skipped(Exception):
+    """Raised by a benchmark whose optional dependencies are not installed."""
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of already-sorted samples."""
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))
+    return samples[index]
+
+
+def rss_mb() -> float:
+    """Current resident set size in MiB (Linux), falling back to the peak."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(samples: list[float], wall: float, cpu: float, items: int = 1) -> dict:
+    """
+    Turn raw per-iteration timings into a result record.
+
+    Args:
+        samples: Seconds per iteration
+        wall: Total wall-clock seconds for all iterations
+        cpu: Total process CPU seconds for all iterations
+        items: Frames (or messages) handled per iteration
+
+    Returns:
+        Dictionary with throughput, latency percentiles, CPU and memory
+    """
+    samples = sorted(samples)
+    count = len(samples)
+    return {
+        "iterations": count,
+        "per_second": round(count * items / wall, 2) if wall else None,
+        "mean_ms": round(sum(samples) / count * 1000, 3) if count else None,
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+        "cpu_percent": round(cpu / wall * 100, 1) if wall else None,
+        "rss_mb": round(rss_mb(), 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def measure(
+    fn: Callable[[], object],
+    iterations: int = 50,
+    warmup: int = 3,
+    items: int = 1,
+) -> dict:
+    """
+    Time a synchronous callable.
+
+    Args:
+        fn: The operation to time
+        iterations: Timed calls
+        warmup: Untimed calls first (model loading, caches)
+        items: Frames handled per call, for the throughput figure
+
+    Returns:
+        Result record from summarize()
+    """
+    for _ in range(warmup):
+        fn()
+
+    gc.collect()
+    samples = []
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    return summarize(samples, wall, cpu, items)
+
+
+def synthetic_frame(width: int, height: int, seed: int = 0):
+    """
+    A deterministic BGR frame with smooth background and face-sized blobs.
+
+    It is not meant to contain detectable faces; it gives the cascades a
+    realistic amount of structure to reject, unlike a flat or pure-noise image.
+    """
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    frame = np.zeros((height, width, 3), np.uint8)
+    frame[:] = np.linspace(40, 200, width, dtype=np.uint8)[None, :, None]
+    for _ in range(6):
+        center = (int(rng.integers(0, width)), int(rng.integers(0, height)))
+        axes = (int(rng.integers(20, width // 6)), int(rng.integers(25, height // 4)))
+        color = tuple(int(c) for c in rng.integers(60, 230, 3))
+        cv2.ellipse(frame, center, axes, 0, 0, 360, color, -1)
+    noise = rng.normal(0, 6, frame.shape)
+    return np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+
+def photo_frames(width: int, height: int) -> dict:
+    """
+    The bundled photos, resized to the given resolution.
+
+    Returns:
+        Dictionary of photo name to BGR frame
+    """
+    import cv2
+
+    frames = {}
+    for path in sorted(PHOTOS_DIR.glob("*.jpeg")):
+        image = cv2.imread(str(path))
+        if image is not None:
+            frames[path.stem] = cv2.resize(
+                image, (width, height), interpolation=cv2.INTER_AREA
+            )
+    return frames
+
+
+def require(*modules: str):
+    """Raise Skipped unless every named module can be imported."""
+    import importlib
+
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            raise Skipped(f"{module} not available: {e}")
+
+
+def environment() -> dict:
+    """Describe the machine so results from different hosts are not mixed up."""
+    info = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+    try:
+        import cv2
+
+        info["opencv"] = cv2.__version__
+        info["opencv_threads"] = cv2.getNumThreads()
+    except ImportError:
+        info["opencv"] = None
+    return info
+
+
+def write_results(path: Path, results: dict):
+    """Write a results document as pretty-printed JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n")
+
+
+def load_results(path: Path) -> Optional[dict]:
+    """Read a results document, or None if it does not exist."""
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
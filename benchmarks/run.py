@@ -0,0 +1,128 @@
+"""
+Run the benchmark suite and save the results as JSON.
+
+Usage:
+    python benchmarks/run.py
+    python benchmarks/run.py --only detector cascade_params --backends haar lbp
+    python benchmarks/run.py --baseline benchmarks/baseline.json
+
+With --baseline, every case is compared against the saved run and the exit
+status is 1 if any case got slower (lower throughput or higher p50/p99) by
+more than --tolerance.
+"""
+
+import argparse
+import sys
+import traceback
+from pathlib import Path
+
+from harness import Skipped, environment, load_results, write_results
+
+from bench_broadcast import bench_broadcast
+from bench_detection import bench_cascade_params, bench_detector
+from bench_remote_decode import bench_remote_decode
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "latest.json"
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Find cases that regressed against a baseline run.
+
+    Args:
+        current: Results document from this run
+        baseline: Results document to compare against
+        tolerance: Allowed relative slowdown (0.15 = 15%)
+
+    Returns:
+        Human-readable regression descriptions
+    """
+    regressions = []
+    for suite, cases in current["suites"].items():
+        old_cases = baseline.get("suites", {}).get(suite, {})
+        for case, record in cases.items():
+            old = old_cases.get(case)
+            if not isinstance(old, dict) or "per_second" not in record:
+                continue
+
+            if old.get("per_second") and record.get("per_second") is not None:
+                change = record["per_second"] / old["per_second"] - 1
+                if change < -tolerance:
+                    regressions.append(
+                        f"{suite}/{case}: throughput {old['per_second']} -> "
+                        f"{record['per_second']}/s ({change:+.0%})"
+                    )
+            for metric in ("p50_ms", "p99_ms"):
+                if old.get(metric) and record.get(metric) is not None:
+                    change = record[metric] / old[metric] - 1
+                    if change > tolerance:
+                        regressions.append(
+                            f"{suite}/{case}: {metric} {old[metric]} -> "
+                            f"{record[metric]} ({change:+.0%})"
+                        )
+    return regressions
+
+
+def main():
+    suites = {
+        "detector": lambda args: bench_detector(args.backends, args.iterations),
+        "cascade_params": lambda args: bench_cascade_params(
+            max(1, args.iterations // 2)
+        ),
+        "broadcast": lambda args: bench_broadcast(args.iterations * 5),
+        "remote_decode": lambda args: bench_remote_decode(args.iterations),
+    }
+
+    parser = argparse.ArgumentParser(description="Run presence detection benchmarks")
+    parser.add_argument("--only", nargs="+", choices=sorted(suites), default=None)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=["haar"],
+        help="Detection backends for the detector suite (default: haar)",
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=30, help="Timed iterations per case"
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="Allowed relative slowdown against the baseline (default: 0.15)",
+    )
+    args = parser.parse_args()
+
+    results = {"environment": environment(), "suites": {}}
+    for name in args.only or suites:
+        print(f"Running {name}...", file=sys.stderr)
+        try:
+            results["suites"][name] = suites[name](args)
+        except Skipped as e:
+            print(f"  skipped: {e}", file=sys.stderr)
+            results["suites"][name] = {"skipped": str(e)}
+        except Exception as e:
+            traceback.print_exc()
+            results["suites"][name] = {"error": str(e)}
+
+    write_results(args.output, results)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        if baseline is None:
+            print(f"Error: baseline {args.baseline} not found", file=sys.stderr)
+            return 1
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against baseline.", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
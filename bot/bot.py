@@ -37,15 +37,24 @@ from pipecat.services.google.llm import GoogleLLMService
 
 from processors import (
     ScriptProcessor,
-    BotFaceProcessor,
+    BotFaceObserver,
     RemotePresenceProcessor,
     LocalPresenceProcessor,
+    VideoSamplingPolicy,
+    AudioCache,
+    CachingTTSService,
+    cartesia_stream,
+    local_stream,
+    synthesizer,
 )
 
 
 # Load environment variables
 load_dotenv(override=True)
 
+# Face detection on participants' camera video (Daily only)
+remote_presence_enabled = os.getenv("REMOTE_PRESENCE", "false").lower() == "true"
+
 # Function handlers for the LLM
 search_tool = {"google_search": {}}
 tools = [search_tool]
@@ -71,10 +80,37 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
 
     stt = DeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY"))
 
-    tts = CartesiaTTSService(
-        api_key=os.getenv("CARTESIA_API_KEY"),
-        voice_id="32b3f3c5-7171-46aa-abe7-b598964aa793",
-    )
+    # Live TTS and the script's pre-synthesised lines share voice and model
+    voice_id = "32b3f3c5-7171-46aa-abe7-b598964aa793"
+    tts_model = os.getenv("CARTESIA_MODEL", "sonic-2")
+    # LOCAL_TTS swaps Cartesia for an offline stand-in (tones, no API key)
+    local_tts = os.getenv("LOCAL_TTS", "false").lower() == "true"
+    if local_tts:
+        speech_stream = local_stream(realtime=True)
+        # Keep stand-in audio apart from real speech in the caches
+        voice_id = f"local:{voice_id}"
+    else:
+        speech_stream = cartesia_stream(os.getenv("CARTESIA_API_KEY"), model=tts_model)
+
+    tts_cache_dir = os.getenv("TTS_CACHE", "")
+    if tts_cache_dir or local_tts:
+        # Recurring phrases are served from disk instead of calling the TTS service
+        tts_cache_max_mb = float(os.getenv("TTS_CACHE_MAX_MB", "200"))
+        tts = CachingTTSService(
+            stream=speech_stream,
+            # Cached audio is only valid for the model that produced it
+            cache=AudioCache(
+                os.path.join(tts_cache_dir or ".cache/tts", tts_model),
+                max_bytes=int(tts_cache_max_mb * 1024 * 1024),
+            ),
+            voice_id=voice_id,
+        )
+    else:
+        tts = CartesiaTTSService(
+            api_key=os.getenv("CARTESIA_API_KEY"),
+            voice_id=voice_id,
+            model=tts_model,
+        )
 
     rtvi = RTVIProcessor(config=RTVIConfig(config=[]))
 
@@ -83,9 +119,18 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
         system_instruction=system_instruction,
         tools=tools,
     )
-    # script_processor = ScriptProcessor(script)
+    # Scripted lines are synthesised once and played from this cache (opt-in)
+    script_audio_dir = os.getenv("SCRIPT_AUDIO_CACHE", "")
+    script_audio = {}
+    if script_audio_dir:
+        script_audio = dict(
+            audio_cache=AudioCache(os.path.join(script_audio_dir, tts_model)),
+            voice_id=voice_id,
+            synthesize=synthesizer(speech_stream),
+        )
+    # script_processor = ScriptProcessor(script, **script_audio)
     # Just make him act like a normal bot for now
-    script_processor = ScriptProcessor([])
+    script_processor = ScriptProcessor([], **script_audio)
 
     messages = [
         {
@@ -96,14 +141,27 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
     context = LLMContext(messages)
 
     context_aggregator = LLMContextAggregatorPair(context)
-    bot_face = BotFaceProcessor()
-    remote_presence = RemotePresenceProcessor()
-    local_presence = LocalPresenceProcessor(messages=messages)
+    detection_backend = os.getenv("DETECTION_BACKEND", "haar")
+    detection_model_path = os.getenv("DETECTION_MODEL_PATH") or None
+    detection_profile = os.getenv("DETECTION_PROFILE") or None
+    remote_presence = RemotePresenceProcessor(
+        backend=detection_backend,
+        model_path=detection_model_path,
+        profile=detection_profile,
+    )
+    local_presence = LocalPresenceProcessor(
+        messages=messages,
+        backend=detection_backend,
+        model_path=detection_model_path,
+        profile=detection_profile,
+        worker=os.getenv("DETECTION_WORKER", "thread"),
+        presence_url=os.getenv("PRESENCE_SERVICE_URL", "ws://localhost:8765/ws"),
+    )
 
     pipeline = Pipeline(
         [
             transport.input(),
-            # remote_presence,
+            *([remote_presence] if remote_presence_enabled else []),
             # local_presence,
             rtvi,
             stt,
@@ -111,12 +169,14 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
             script_processor,
             llm,
             tts,
-            bot_face,
             transport.output(),
             context_aggregator.assistant(),
         ]
     )
 
+    async def send_face_message(frame):
+        await task.queue_frame(frame)
+
     task = PipelineTask(
         pipeline,
         params=PipelineParams(
@@ -125,7 +185,7 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
             enable_usage_metrics=True,
             report_only_initial_ttfb=True,
         ),
-        observers=[RTVIObserver(rtvi)],
+        observers=[RTVIObserver(rtvi), BotFaceObserver(send=send_face_message)],
     )
 
     @rtvi.event_handler("on_client_ready")
@@ -152,8 +212,23 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
     @transport.event_handler("on_client_connected")
     async def on_client_connected(transport, client):
         logger.info("!!! Client connected")
+        if remote_presence_enabled:
+            await maybe_capture_participant_camera(
+                transport, client, remote_presence.sampling_policy(client["id"])
+            )
         await task.queue_frames([LLMRunFrame()])
 
+    @remote_presence.event_handler("on_sampling_policy_changed")
+    async def on_sampling_policy_changed(processor, user_id, policy):
+        if remote_presence_enabled:
+            await maybe_capture_participant_camera(transport, {"id": user_id}, policy)
+
+    if remote_presence_enabled:
+        # Only Daily receives participant video (see video_in_enabled below)
+        @transport.event_handler("on_participant_left")
+        async def on_remote_participant_left(transport, participant, reason):
+            await remote_presence.remove_participant(participant["id"])
+
     @transport.event_handler("on_client_disconnected")
     async def on_participant_left(transport, client):
         logger.info("Client disconnected")
@@ -166,23 +241,38 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
 
 
 async def maybe_capture_participant_camera(
-    transport: BaseTransport, client: any, framerate: int = 0
+    transport: BaseTransport, client: any, policy: VideoSamplingPolicy
 ):
     """Capture participant camera video if transport supports it.
 
+    Calling it again with a new policy updates the capture in place.
+
     Args:
         transport: The transport instance.
         client: Transport-specific client object.
-        framerate: Video capture framerate. Defaults to 0 (auto).
+        policy: Frame rate and quality the presence processor needs.
     """
     try:
         from pipecat.transports.daily.transport import DailyTransport
 
         if isinstance(transport, DailyTransport):
+            # Receive only the simulcast layer detection needs, at the rate it checks
+            await transport.update_subscriptions(
+                participant_settings={
+                    client["id"]: {
+                        "media": {
+                            "camera": {
+                                "subscriptionState": "subscribed",
+                                "receiveSettings": {"maxQuality": policy.max_quality},
+                            }
+                        }
+                    }
+                }
+            )
             await transport.capture_participant_video(
-                client["id"], framerate=1, video_source="camera"
+                client["id"], framerate=policy.framerate, video_source="camera"
             )
-            logger.info(f"Capturing camera for participant {client}")
+            logger.info(f"Capturing camera for participant {client['id']}: {policy}")
     except ImportError:
         pass
 
@@ -194,8 +284,7 @@ async def bot(runner_args: RunnerArguments):
         "daily": lambda: DailyParams(
             audio_in_enabled=True,
             audio_out_enabled=True,
-            # TODO-CB: Send camera to transport
-            video_in_enabled=False,
+            video_in_enabled=remote_presence_enabled,
             vad_analyzer=SileroVADAnalyzer(params=VADParams(stop_secs=0.2)),
             turn_analyzer=LocalSmartTurnAnalyzerV3(),
         ),
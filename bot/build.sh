@@ -5,9 +5,9 @@ VERSION="0.3"
 DOCKER_USERNAME="pluot"
 AGENT_NAME="squobert"
 
-# Build the Docker image with the correct context
+# Build the Docker image from the repository root so facedetect is in context
 echo "Building Docker image..."
-docker build --platform=linux/arm64 -t "$DOCKER_USERNAME/$AGENT_NAME:$VERSION" -t "$DOCKER_USERNAME/$AGENT_NAME:latest" .
+docker build --platform=linux/arm64 -f Dockerfile -t "$DOCKER_USERNAME/$AGENT_NAME:$VERSION" -t "$DOCKER_USERNAME/$AGENT_NAME:latest" ..
 
 # Push the Docker images
 echo "Pushing Docker image $DOCKER_USERNAME/$AGENT_NAME:$VERSION..."
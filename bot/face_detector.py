@@ -12,30 +12,21 @@ import time
 import sys
 from datetime import datetime
 
+from facedetect import create_backend
 
-def detect_faces(frame, face_cascade):
+
+def detect_faces(frame, backend):
     """
     Detect faces in the given frame.
 
     Args:
         frame: Image frame from webcam
-        face_cascade: Haar cascade classifier for face detection
+        backend: facedetect detection backend
 
     Returns:
-        List of face rectangles (x, y, w, h)
+        List of detected faces
     """
-    # Convert to grayscale for face detection
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-    # Detect faces
-    faces = face_cascade.detectMultiScale(
-        gray,
-        scaleFactor=1.1,
-        minNeighbors=5,
-        minSize=(30, 30)
-    )
-
-    return faces
+    return backend.detect(frame)
 
 
 def main():
@@ -57,6 +48,16 @@ def main():
         action='store_true',
         help='Show the camera feed with face boxes'
     )
+    parser.add_argument(
+        '--backend',
+        default='haar',
+        help='Detection backend: haar, lbp, yunet or ssd (default: haar)'
+    )
+    parser.add_argument(
+        '--profile',
+        default=None,
+        help='Cascade parameter profile: default, pi or accurate'
+    )
     parser.add_argument(
         '--debug',
         action='store_true',
@@ -73,14 +74,11 @@ def main():
         print(f"Error: Could not open camera {args.camera}", file=sys.stderr)
         return 1
 
-    # Load the Haar Cascade for face detection
-    # This uses OpenCV's pre-trained face detection model
-    face_cascade = cv2.CascadeClassifier(
-        cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-    )
-
-    if face_cascade.empty():
-        print("Error: Could not load face detection cascade", file=sys.stderr)
+    # Load the face detection backend
+    try:
+        backend = create_backend(args.backend, profile=args.profile)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
         cap.release()
         return 1
 
@@ -108,7 +106,7 @@ def main():
                 last_capture_time = current_time
 
                 # Detect faces
-                faces = detect_faces(frame, face_cascade)
+                faces = detect_faces(frame, backend)
 
                 # Print results
                 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -119,8 +117,14 @@ def main():
 
                 # Draw rectangles around faces if showing
                 if args.show:
-                    for (x, y, w, h) in faces:
-                        cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
+                    for face in faces:
+                        cv2.rectangle(
+                            frame,
+                            (face.x, face.y),
+                            (face.x + face.w, face.y + face.h),
+                            (0, 255, 0),
+                            2
+                        )
 
             # Display the frame if requested
             if args.show or args.debug:
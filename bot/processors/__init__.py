@@ -3,16 +3,32 @@ Squobert processors package
 """
 
 from .script_processor import ScriptProcessor
-from .bot_face_processor import BotFaceProcessor
-from .remote_presence_processor import RemotePresenceProcessor
+from .audio_cache import (
+    AudioCache,
+    cartesia_stream,
+    local_stream,
+    synthesizer,
+)
+from .caching_tts import CachingTTSService
+from .bot_face_processor import BotFaceObserver, BotFaceProcessor
+from .face_state import FaceStateEngine
+from .remote_presence_processor import RemotePresenceProcessor, VideoSamplingPolicy
 from .local_presence_processor import LocalPresenceProcessor
 from .presence_frame import PresenceFrame
 from .session_frames import StartSessionFrame, StopSessionFrame
 
 __all__ = [
     "ScriptProcessor",
+    "AudioCache",
+    "cartesia_stream",
+    "local_stream",
+    "synthesizer",
+    "CachingTTSService",
     "BotFaceProcessor",
+    "BotFaceObserver",
+    "FaceStateEngine",
     "RemotePresenceProcessor",
+    "VideoSamplingPolicy",
     "LocalPresenceProcessor",
     "PresenceFrame",
     "StartSessionFrame",
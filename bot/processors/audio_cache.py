@@ -0,0 +1,254 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import array
+import asyncio
+import hashlib
+import json
+import math
+import os
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable
+
+import aiohttp
+from loguru import logger
+
+# Synthesise (text, voice_id, sample_rate) into raw 16-bit mono PCM
+Synthesizer = Callable[[str, str, int], Awaitable[bytes]]
+# Same, streamed as PCM chunks of whole samples as they are produced. Streams
+# also take an optional session keyword: an aiohttp.ClientSession to reuse
+# across calls (HTTP-backed streams open a session per call without one)
+SpeechStream = Callable[..., AsyncIterator[bytes]]
+
+
+def normalize_text(text: str) -> str:
+    """Fold the spellings of a phrase that are spoken identically to one form."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+class AudioCache:
+    """
+    On-disk cache of synthesised speech.
+
+    Each entry is raw 16-bit mono PCM in its own file, named by a hash of the
+    normalised text, voice and sample rate, so the same line is only ever
+    synthesised once per voice and output rate. With max_bytes set, the least
+    recently used entries are evicted to stay under the cap; recency survives
+    restarts through the files' modification times.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int | None = None):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the cached audio (created if missing)
+            max_bytes: Size cap for all entries together (default: unbounded)
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+
+        # Entry key -> size, least recently used first
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        existing = sorted(self._directory.glob("*.pcm"), key=lambda p: p.stat().st_mtime)
+        for path in existing:
+            self._entries[path.stem] = path.stat().st_size
+        self._size = sum(self._entries.values())
+        self._evict()
+
+    @property
+    def size(self) -> int:
+        """Total bytes of cached audio."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(text: str, voice_id: str, sample_rate: int) -> str:
+        """Content address of one line of speech."""
+        content = json.dumps([normalize_text(text), voice_id, sample_rate])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f"{key}.pcm"
+
+    def get(self, text: str, voice_id: str, sample_rate: int) -> bytes | None:
+        """
+        Look up cached audio.
+
+        Returns:
+            The PCM audio, or None if it has not been cached
+        """
+        key = self.key(text, voice_id, sample_rate)
+        path = self._path(key)
+        try:
+            audio = path.read_bytes()
+        except FileNotFoundError:
+            self._forget(key)
+            return None
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        os.utime(path)
+        return audio
+
+    def put(self, text: str, voice_id: str, sample_rate: int, audio: bytes):
+        """Store audio, replacing the entry atomically, then evict over the cap."""
+        key = self.key(text, voice_id, sample_rate)
+        path = self._path(key)
+        partial = path.with_suffix(f".{os.getpid()}.tmp")
+        partial.write_bytes(audio)
+        os.replace(partial, path)
+
+        self._forget(key)
+        self._entries[key] = len(audio)
+        self._size += len(audio)
+        self._evict()
+
+    def _forget(self, key: str):
+        self._size -= self._entries.pop(key, 0)
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its cap."""
+        if self._max_bytes is None:
+            return
+        while self._size > self._max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            self._path(key).unlink(missing_ok=True)
+            logger.debug(f"Evicted cached audio {key[:12]} ({size} bytes)")
+
+
+def cartesia_stream(
+    api_key: str,
+    model: str = "sonic-2",
+    base_url: str = "https://api.cartesia.ai",
+    cartesia_version: str = "2024-11-13",
+) -> SpeechStream:
+    """
+    Build a SpeechStream backed by Cartesia's HTTP /tts/bytes endpoint.
+
+    The response body is read as it arrives, so the first audio is available
+    after the service's time-to-first-byte rather than the whole synthesis.
+    Pass a long-lived session to reuse its connections; otherwise each call
+    opens its own and pays a new TCP and TLS handshake.
+
+    Args:
+        api_key: Cartesia API key
+        model: TTS model (default: "sonic-2")
+        base_url: Cartesia HTTP API base URL
+        cartesia_version: Cartesia API version
+
+    Returns:
+        Async generator function yielding raw PCM for (text, voice_id,
+        sample_rate, session=None)
+    """
+
+    async def stream(
+        text: str,
+        voice_id: str,
+        sample_rate: int,
+        session: aiohttp.ClientSession | None = None,
+    ) -> AsyncIterator[bytes]:
+        if session is None:
+            async with aiohttp.ClientSession() as session:
+                async for chunk in stream(text, voice_id, sample_rate, session):
+                    yield chunk
+            return
+
+        payload = {
+            "model_id": model,
+            "transcript": text,
+            "voice": {"mode": "id", "id": voice_id},
+            "output_format": {
+                "container": "raw",
+                "encoding": "pcm_s16le",
+                "sample_rate": sample_rate,
+            },
+        }
+        headers = {
+            "Cartesia-Version": cartesia_version,
+            "X-API-Key": api_key,
+            "Content-Type": "application/json",
+        }
+        async with session.post(
+            f"{base_url}/tts/bytes", json=payload, headers=headers
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise RuntimeError(
+                    f"Cartesia API returned status {response.status}: {error_text}"
+                )
+            remainder = b""
+            async for chunk in response.content.iter_any():
+                # Only hand out whole 16-bit samples
+                chunk = remainder + chunk
+                cut = len(chunk) - len(chunk) % 2
+                remainder = chunk[cut:]
+                if cut:
+                    yield chunk[:cut]
+
+    return stream
+
+
+def synthesizer(stream: SpeechStream) -> Synthesizer:
+    """Build a Synthesizer that collects a SpeechStream's chunks."""
+
+    async def synthesize(text: str, voice_id: str, sample_rate: int) -> bytes:
+        return b"".join([chunk async for chunk in stream(text, voice_id, sample_rate)])
+
+    return synthesize
+
+
+def local_stream(
+    words_per_second: float = 2.5, chunk_seconds: float = 0.1, realtime: bool = False
+) -> SpeechStream:
+    """
+    Build an offline stand-in SpeechStream for development and tests.
+
+    Each word becomes a short tone, its pitch picked from the word and voice,
+    followed by a gap, so output is deterministic and roughly as long as real
+    speech of the same text. No network or API key is involved.
+
+    Args:
+        words_per_second: Speaking rate (default: 2.5)
+        chunk_seconds: Audio per yielded chunk (default: 0.1)
+        realtime: Pace chunks like a streaming service would (default: False)
+
+    Returns:
+        Async generator function yielding raw PCM for (text, voice_id,
+        sample_rate, session=None); the session is ignored
+    """
+
+    async def stream(
+        text: str, voice_id: str, sample_rate: int, session=None
+    ) -> AsyncIterator[bytes]:
+        word_samples = int(sample_rate / words_per_second)
+        tone_samples = word_samples * 3 // 4
+        samples = array.array("h")
+        for word in normalize_text(text).split(" "):
+            if not word:
+                continue
+            digest = hashlib.sha256(f"{voice_id}:{word}".encode("utf-8")).digest()
+            frequency = 180 + digest[0] * 2
+            samples.extend(
+                int(6000 * math.sin(2 * math.pi * frequency * n / sample_rate))
+                for n in range(tone_samples)
+            )
+            samples.extend([0] * (word_samples - tone_samples))
+
+        audio = samples.tobytes()
+        chunk_size = int(sample_rate * chunk_seconds) * 2
+        for offset in range(0, len(audio), chunk_size):
+            if realtime:
+                await asyncio.sleep(chunk_seconds)
+            yield audio[offset : offset + chunk_size]
+
+    return stream
@@ -5,6 +5,8 @@
 #
 
 import random
+from collections import deque
+from typing import Awaitable, Callable
 
 from loguru import logger
 
@@ -15,82 +17,167 @@ from pipecat.frames.frames import (
     UserStartedSpeakingFrame,
     UserStoppedSpeakingFrame,
 )
+from pipecat.observers.base_observer import BaseObserver, FramePushed
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 from pipecat.processors.frameworks.rtvi import RTVIServerMessageFrame
 from pipecat.services.google.llm import LLMSearchResponseFrame
+from .face_state import FaceStateEngine
 from .session_frames import StartSessionFrame, StopSessionFrame
 
 
 # also "sleeping" but we don't want that one randomly
 emotions = ["resting", "laughing", "kawaii", "nervous"]
 
+# Frame type -> handler returning the face messages (RTVI server message data)
+FaceHandler = Callable[[Frame], list[dict]]
+_handlers: dict[type, FaceHandler] = {}
+# Every frame type seen so far -> its handler (None: not a face event)
+_dispatch: dict[type, FaceHandler | None] = {}
+
+
+def handles(*frame_types: type):
+    """Register a function as the face handler for the given frame types."""
+
+    def register(handler: FaceHandler) -> FaceHandler:
+        for frame_type in frame_types:
+            _handlers[frame_type] = handler
+        _dispatch.clear()
+        return handler
+
+    return register
+
+
+def _handler_for(frame_type: type) -> FaceHandler | None:
+    """Look up a frame type's handler, resolving subclasses once per type."""
+    try:
+        return _dispatch[frame_type]
+    except KeyError:
+        handler = next(
+            (_handlers[t] for t in frame_type.__mro__ if t in _handlers), None
+        )
+        _dispatch[frame_type] = handler
+        return handler
+
+
+@handles(UserStartedSpeakingFrame)
+def _user_started_speaking(frame: UserStartedSpeakingFrame) -> list[dict]:
+    return [{"event": "user_started_speaking"}]
+
+
+@handles(UserStoppedSpeakingFrame)
+def _user_stopped_speaking(frame: UserStoppedSpeakingFrame) -> list[dict]:
+    return [{"event": "user_stopped_speaking"}]
+
+
+@handles(BotStartedSpeakingFrame)
+def _bot_started_speaking(frame: BotStartedSpeakingFrame) -> list[dict]:
+    return [{"event": "bot_started_speaking"}]
+
+
+@handles(BotStoppedSpeakingFrame)
+def _bot_stopped_speaking(frame: BotStoppedSpeakingFrame) -> list[dict]:
+    # INFO: The bot also suports hide_text, and show_text as
+    # {"event": "show_text", "data": {"text": "test text", "duration": 3}}
+    return [
+        {"event": "bot_stopped_speaking"},
+        {"event": "expression_change", "data": {"expression": random.choice(emotions)}},
+    ]
+
+
+@handles(StartSessionFrame)
+def _start_session(frame: StartSessionFrame) -> list[dict]:
+    return [{"event": "expression_change", "data": {"expression": "kawaii"}}]
+
+
+@handles(StopSessionFrame)
+def _stop_session(frame: StopSessionFrame) -> list[dict]:
+    return [{"event": "expression_change", "data": {"expression": "sleeping"}}]
+
+
+@handles(LLMSearchResponseFrame)
+def _search_response(frame: LLMSearchResponseFrame) -> list[dict]:
+    titles_list = list(dict.fromkeys(origin["site_title"] for origin in frame.origins))
+    titles = (
+        ", ".join(titles_list[:-1]) + " and " + titles_list[-1]
+        if len(titles_list) > 1
+        else titles_list[0]
+        if titles_list
+        else ""
+    )
+    message = f"Info from {titles}"
+    return [{"event": "show_text", "data": {"text": message, "duration": 10}}]
+
+
+class BotFaceObserver(BaseObserver):
+    """
+    Sends face messages for frames seen anywhere in the pipeline, as an observer.
+
+    Only downstream pushes are considered, and each frame (by id) only once,
+    however many processors it passes between. Messages are coalesced by a
+    FaceStateEngine and handed to send, e.g. the pipeline task's queue_frame.
+    """
+
+    def __init__(
+        self, send: Callable[[Frame], Awaitable[None]], window: float = 0.15, **kwargs
+    ):
+        """
+        Initialize the observer.
+
+        Args:
+            send: Coroutine function that delivers an RTVIServerMessageFrame
+            window: Shortest time between two face messages, in seconds (default: 0.15)
+        """
+        super().__init__(**kwargs)
+        self._send = send
+        self._engine = FaceStateEngine(self._send_message, window)
+        self._seen: deque[int] = deque(maxlen=32)
+
+    async def _send_message(self, data: dict):
+        logger.debug(f"SERVER MESSAGE: {data}")
+        await self._send(RTVIServerMessageFrame(data=data))
+
+    async def handle_frame(self, frame: Frame):
+        """Submit the face messages for a frame, unless it was already handled."""
+        handler = _handler_for(type(frame))
+        if not handler or frame.id in self._seen:
+            return
+        self._seen.append(frame.id)
+
+        for message in handler(frame):
+            await self._engine.submit(message)
+
+    async def on_push_frame(self, data: FramePushed):
+        if data.direction == FrameDirection.DOWNSTREAM:
+            await self.handle_frame(data.frame)
+
+    async def cleanup(self):
+        await self._engine.close()
+        await super().cleanup()
+
 
-# TODO: This could probably be an observer?
 class BotFaceProcessor(FrameProcessor):
+    """
+    Sends face messages for the frames passing through, as a pipeline processor.
+
+    A thin wrapper around BotFaceObserver that pushes the messages downstream
+    itself. Prefer the observer, which is not on the frame path.
+    """
+
+    def __init__(self, window: float = 0.15, **kwargs):
+        """
+        Initialize the processor.
+
+        Args:
+            window: Shortest time between two face messages, in seconds (default: 0.15)
+        """
+        super().__init__(**kwargs)
+        self._observer = BotFaceObserver(send=self.push_frame, window=window)
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
-        if isinstance(frame, UserStartedSpeakingFrame):
-            msg_frame = RTVIServerMessageFrame(data={"event": "user_started_speaking"})
-            logger.info("SERVER MESSAGE: User started speaking")
-            await self.push_frame(msg_frame)
-        elif isinstance(frame, UserStoppedSpeakingFrame):
-            msg_frame = RTVIServerMessageFrame(data={"event": "user_stopped_speaking"})
-            logger.info("SERVER MESSAGE: User stopped speaking")
-            await self.push_frame(msg_frame)
-        elif isinstance(frame, BotStartedSpeakingFrame):
-            msg_frame = RTVIServerMessageFrame(data={"event": "bot_started_speaking"})
-            logger.info("SERVER MESSAGE: Bot started speaking")
-            await self.push_frame(msg_frame)
-        elif isinstance(frame, BotStoppedSpeakingFrame):
-            msg_frame = RTVIServerMessageFrame(data={"event": "bot_stopped_speaking"})
-            logger.info("SERVER MESSAGE: Bot stopped speaking")
-            await self.push_frame(msg_frame)
-            emotion_frame = RTVIServerMessageFrame(
-                data={
-                    "event": "expression_change",
-                    "data": {"expression": random.choice(emotions)},
-                }  # random.choice(emotions)
-            )
-            await self.push_frame(emotion_frame)
-            # INFO: The bot also suports hide_text,
-            # text_frame = RTVIServerMessageFrame(
-            #     data={
-            #         "event": "show_text",
-            #         "data": {"text": "test text", "duration": 3},
-            #     }
-            # )
-            # await self.push_frame(text_frame)
-        elif isinstance(frame, StartSessionFrame):
-            emotion_frame = RTVIServerMessageFrame(
-                data={
-                    "event": "expression_change",
-                    "data": {"expression": "kawaii"},
-                }  # random.choice(emotions)
-            )
-            await self.push_frame(emotion_frame)
-        elif isinstance(frame, StopSessionFrame):
-            emotion_frame = RTVIServerMessageFrame(
-                data={
-                    "event": "expression_change",
-                    "data": {"expression": "sleeping"},
-                }  # random.choice(emotions)
-            )
-            await self.push_frame(emotion_frame)
-        elif isinstance(frame, LLMSearchResponseFrame):
-            titles_list = list(
-                dict.fromkeys(origin["site_title"] for origin in frame.origins)
-            )
-            titles = (
-                ", ".join(titles_list[:-1]) + " and " + titles_list[-1]
-                if len(titles_list) > 1
-                else titles_list[0]
-                if titles_list
-                else ""
-            )
-            message = f"Info from {titles}"
-            text_frame = RTVIServerMessageFrame(
-                data={"event": "show_text", "data": {"text": message, "duration": 10}}
-            )
-            await self.push_frame(text_frame)
-
+        await self._observer.handle_frame(frame)
         await self.push_frame(frame, direction)
+
+    async def cleanup(self):
+        await self._observer.cleanup()
+        await super().cleanup()
@@ -0,0 +1,138 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+from typing import AsyncGenerator
+
+import aiohttp
+from loguru import logger
+
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    ErrorFrame,
+    Frame,
+    StartFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+)
+from pipecat.services.tts_service import TTSService
+
+from .audio_cache import AudioCache, SpeechStream
+
+
+class CachingTTSService(TTSService):
+    """
+    TTS service that serves recurring phrases from an AudioCache.
+
+    Each sentence is looked up by its normalised text, voice and sample rate.
+    Hits are streamed back as audio frames straight from disk without calling
+    the speech service; misses are streamed from it (e.g. cartesia_stream, or
+    local_stream offline) and stored once they complete. Interrupted or failed
+    syntheses are never cached. Misses share one aiohttp session, opened when
+    the service starts and closed when it stops, so they reuse connections.
+    """
+
+    def __init__(
+        self,
+        *,
+        stream: SpeechStream,
+        cache: AudioCache,
+        voice_id: str,
+        **kwargs,
+    ):
+        """
+        Initialize the caching TTS service.
+
+        Args:
+            stream: Speech service used on cache misses
+            cache: Cache of synthesised phrases
+            voice_id: Voice to speak in
+            **kwargs: Additional TTSService arguments
+        """
+        super().__init__(**kwargs)
+        self._stream = stream
+        self._cache = cache
+        self.set_voice(voice_id)
+        self._session: aiohttp.ClientSession | None = None
+        self._hits = 0
+        self._misses = 0
+
+    def can_generate_metrics(self) -> bool:
+        return True
+
+    async def start(self, frame: StartFrame):
+        """Start the service and open the session misses are streamed over."""
+        await super().start(frame)
+        self._session = aiohttp.ClientSession()
+
+    async def stop(self, frame: EndFrame):
+        """Stop the service and close its session."""
+        await super().stop(frame)
+        await self._close_session()
+
+    async def cancel(self, frame: CancelFrame):
+        """Cancel the service and close its session."""
+        await super().cancel(frame)
+        await self._close_session()
+
+    async def _close_session(self):
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        """
+        Speak a sentence from the cache, or synthesise and cache it.
+
+        Args:
+            text: The text to synthesize into speech
+
+        Yields:
+            Frame: TTSStartedFrame, audio frames and TTSStoppedFrame
+        """
+        await self.start_ttfb_metrics()
+        # Cache lookups and writes touch disk; keep them off the event loop
+        audio = await asyncio.to_thread(
+            self._cache.get, text, self._voice_id, self.sample_rate
+        )
+        yield TTSStartedFrame()
+
+        if audio is not None:
+            self._hits += 1
+            logger.debug(f"{self}: Cached TTS [{text}] ({self._hits} hits, {self._misses} misses)")
+            await self.stop_ttfb_metrics()
+            for offset in range(0, len(audio), self.chunk_size):
+                yield TTSAudioRawFrame(
+                    audio=audio[offset : offset + self.chunk_size],
+                    sample_rate=self.sample_rate,
+                    num_channels=1,
+                )
+            yield TTSStoppedFrame()
+            return
+
+        self._misses += 1
+        logger.debug(f"{self}: Generating TTS [{text}]")
+        spoken = bytearray()
+        try:
+            async for chunk in self._stream(
+                text, self._voice_id, self.sample_rate, session=self._session
+            ):
+                await self.stop_ttfb_metrics()
+                spoken.extend(chunk)
+                yield TTSAudioRawFrame(audio=chunk, sample_rate=self.sample_rate, num_channels=1)
+            await self.start_tts_usage_metrics(text)
+        except Exception as e:
+            logger.error(f"{self} exception: {e}")
+            await self.stop_ttfb_metrics()
+            yield ErrorFrame(f"Error generating TTS: {e}")
+        else:
+            if spoken:
+                await asyncio.to_thread(
+                    self._cache.put, text, self._voice_id, self.sample_rate, bytes(spoken)
+                )
+        yield TTSStoppedFrame()
@@ -0,0 +1,206 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import json
+import sys
+import threading
+from typing import Callable
+
+from loguru import logger
+
+from facedetect import DetectionBackend, DetectionResult, run_camera_detection
+
+
+class CameraDetectionThread:
+    """
+    Owns a local camera and runs face detection on a dedicated thread.
+
+    Results are handed to on_result from the camera thread. Nothing here
+    touches the event loop; the caller decides how results get back onto it.
+    """
+
+    def __init__(
+        self,
+        camera_index: int,
+        check_interval: float,
+        backend: DetectionBackend,
+        on_result: Callable[[DetectionResult], None],
+    ):
+        """
+        Initialize the camera thread.
+
+        Args:
+            camera_index: Camera device index
+            check_interval: Seconds between face detection checks
+            backend: Detection backend (its model is shared and locked process-wide)
+            on_result: Called from the camera thread with each result
+        """
+        self._camera_index = camera_index
+        self._check_interval = check_interval
+        self._backend = backend
+        self._on_result = on_result
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the camera thread."""
+        if self.running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="local-presence-camera", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the camera thread and wait for it to release the camera (blocking)."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        logger.info("Starting camera capture thread")
+        try:
+            run_camera_detection(
+                self._camera_index,
+                self._check_interval,
+                self._backend,
+                self._on_result,
+                self._stop_event,
+                log=logger.log,
+            )
+        except Exception as e:
+            logger.error(f"Error in camera capture thread: {e}", exc_info=True)
+        finally:
+            logger.info("Camera capture thread stopped")
+
+
+class CameraDetectionProcess:
+    """
+    Runs camera capture and face detection in a separate worker process.
+
+    The worker (``python -m facedetect``) owns the camera and streams
+    JSON lines back over a pipe, so the Haar scan never competes with the
+    pipeline's audio processing for the GIL. Results are delivered to
+    on_result on the event loop.
+    """
+
+    def __init__(
+        self,
+        camera_index: int,
+        check_interval: float,
+        backend: str,
+        model_path: str | None,
+        profile: str | None,
+        on_result: Callable[[DetectionResult], None],
+    ):
+        """
+        Initialize the worker process handle.
+
+        Args:
+            camera_index: Camera device index
+            check_interval: Seconds between face detection checks
+            backend: Detection backend name, loaded inside the worker
+            model_path: Local model file for the backend
+            profile: Cascade parameter profile
+            on_result: Called on the event loop with each result
+        """
+        self._camera_index = camera_index
+        self._check_interval = check_interval
+        self._backend = backend
+        self._model_path = model_path
+        self._profile = profile
+        self._on_result = on_result
+        self._process: asyncio.subprocess.Process | None = None
+        self._reader_task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self):
+        """Launch the worker process and start reading its results."""
+        if self.running:
+            return
+
+        args = [
+            sys.executable,
+            "-m",
+            "facedetect",
+            "--camera",
+            str(self._camera_index),
+            "--interval",
+            str(self._check_interval),
+            "--backend",
+            self._backend,
+        ]
+        if self._model_path:
+            args += ["--model-path", self._model_path]
+        if self._profile:
+            args += ["--profile", self._profile]
+
+        self._process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        self._reader_task = asyncio.create_task(self._read_loop())
+        logger.info(f"Started detection worker process (pid {self._process.pid})")
+
+    async def stop(self, timeout: float = 2.0):
+        """Ask the worker to stop, and kill it if it does not exit in time."""
+        process = self._process
+        if process and process.returncode is None:
+            # Closing stdin is the worker's stop signal
+            if process.stdin:
+                process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Detection worker did not stop in time, killing it")
+                process.kill()
+                await process.wait()
+        self._process = None
+
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+
+    async def _read_loop(self):
+        """Forward results and log lines from the worker until it exits."""
+        process = self._process
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                break
+
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Unexpected output from detection worker: {line!r}")
+                continue
+
+            if message.get("type") == "result":
+                self._on_result(DetectionResult.from_dict(message))
+            elif message.get("type") == "log":
+                logger.log(message["level"], f"[detection worker] {message['message']}")
+
+        returncode = await process.wait()
+        if returncode:
+            logger.error(f"Detection worker exited with status {returncode}")
+        else:
+            logger.info("Detection worker stopped")
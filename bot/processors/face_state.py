@@ -0,0 +1,118 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+# The parts of the client's face state each message sets (see BotFacePanel's
+# handleServerMessage). A message whose parts are all set again by a later one
+# has no visible effect and can be dropped.
+_FACE_FIELDS = {
+    "bot_started_speaking": {"talking", "expression"},
+    "bot_stopped_speaking": {"talking"},
+    "user_started_speaking": {"talking", "expression"},
+    "user_stopped_speaking": {"talking", "expression"},
+    "expression_change": {"expression"},
+    "show_text": {"text"},
+    "hide_text": {"text"},
+}
+
+
+def _superseded(message: dict, fields: set[str]) -> bool:
+    """Whether a later message setting these fields hides this one entirely."""
+    own = _FACE_FIELDS.get(message.get("event"))
+    return bool(own) and own <= fields
+
+
+class FaceStateEngine:
+    """
+    Coalesces face messages and sends at most one per window.
+
+    A message arriving when nothing was sent during the last window goes out
+    immediately; otherwise it waits for the window to end. While waiting,
+    messages superseded by later ones (VAD flapping, an interrupted bot, an
+    expression replaced before it was shown) are dropped, and a message equal
+    to the one just sent is not repeated.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[dict], Awaitable[None]],
+        window: float = 0.15,
+        repeat_interval: float = 1.0,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            send: Coroutine function that delivers one message (RTVI server message data)
+            window: Shortest time between two messages, in seconds (default: 0.15)
+            repeat_interval: Seconds during which a message identical to the last
+                one sent is dropped (default: 1.0)
+        """
+        self._send = send
+        self._window = window
+        self._repeat_interval = repeat_interval
+        self._pending: list[dict] = []
+        self._last_sent: dict | None = None
+        self._last_sent_at = float("-inf")
+        self._flush_task: asyncio.Task | None = None
+
+    @property
+    def _flushing(self) -> bool:
+        return self._flush_task is not None and not self._flush_task.done()
+
+    async def submit(self, message: dict):
+        """Queue a face message, dropping pending ones it supersedes."""
+        fields = _FACE_FIELDS.get(message.get("event"))
+        if fields:
+            kept = [m for m in self._pending if not _superseded(m, fields)]
+            if len(kept) != len(self._pending):
+                logger.debug(f"Face messages superseded by {message['event']}")
+            self._pending = kept
+        self._pending.append(message)
+
+        if self._flushing:
+            return
+        if time.monotonic() - self._last_sent_at >= self._window:
+            await self._send_next()
+        if self._pending:
+            self._flush_task = asyncio.create_task(self._flush())
+
+    async def close(self):
+        """Stop sending and drop anything still pending."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        self._pending.clear()
+
+    async def _flush(self):
+        """Send pending messages one window apart."""
+        while self._pending:
+            delay = self._last_sent_at + self._window - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self._send_next()
+
+    async def _send_next(self):
+        """Send the oldest pending message that is not a repeat."""
+        now = time.monotonic()
+        while self._pending:
+            message = self._pending.pop(0)
+            if message == self._last_sent and now - self._last_sent_at < self._repeat_interval:
+                logger.debug(f"Face message repeated, dropping it: {message}")
+                continue
+            self._last_sent = message
+            self._last_sent_at = now
+            await self._send(message)
+            return
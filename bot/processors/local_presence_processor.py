@@ -5,9 +5,6 @@
 #
 
 import asyncio
-import time
-import cv2
-import numpy as np
 import copy
 
 from loguru import logger
@@ -23,6 +20,10 @@ from pipecat.frames.frames import (
 )
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 
+from facedetect import DetectionResult, create_backend
+
+from .camera_worker import CameraDetectionProcess, CameraDetectionThread
+from .presence_client import PresenceServiceClient
 from .presence_frame import PresenceFrame
 from .session_frames import StartSessionFrame, StopSessionFrame
 
@@ -30,7 +31,10 @@ from .session_frames import StartSessionFrame, StopSessionFrame
 class LocalPresenceProcessor(FrameProcessor):
     """
     Monitors local webcam for face detection.
-    Runs its own camera capture loop and emits a PresenceFrame when the face count changes.
+    Capture and detection run on a dedicated thread or worker process so the camera
+    never blocks the pipeline's audio, or come from the presence service's /ws feed
+    so only one process opens the camera. Results come back through a queue and a
+    PresenceFrame is emitted when the face count changes.
     Emits StartSessionFrame after sustained presence (5s) and StopSessionFrame after sustained absence (10s).
     Starts capturing on StartFrame, stops on EndFrame or CancelFrame.
     """
@@ -42,6 +46,11 @@ class LocalPresenceProcessor(FrameProcessor):
         check_interval: float = 1.0,
         start_session_delay: float = 5.0,
         stop_session_delay: float = 5.0,
+        backend: str = "haar",
+        model_path: str | None = None,
+        profile: str | None = None,
+        worker: str = "thread",
+        presence_url: str = "ws://localhost:8765/ws",
     ):
         """
         Initialize the local presence processor.
@@ -51,8 +60,18 @@ class LocalPresenceProcessor(FrameProcessor):
             check_interval: Time in seconds between face detection checks (default: 1.0)
             start_session_delay: Seconds of sustained presence before starting session (default: 5.0)
             stop_session_delay: Seconds of sustained absence before stopping session (default: 5.0)
+            backend: Detection backend name: haar, lbp, yunet or ssd (default: haar)
+            model_path: Local model file for the backend (default: backend search)
+            profile: Cascade parameter profile, e.g. "pi" (default: "default")
+            worker: Where capture and detection run: "thread", "process" for a
+                separate worker process that keeps vision off the GIL, or "service" to
+                follow the presence service at presence_url without opening the
+                camera at all (default: thread)
+            presence_url: Presence service WebSocket URL for the "service" worker
         """
         super().__init__()
+        if worker not in ("thread", "process", "service"):
+            raise ValueError(f"Unknown detection worker: {worker}")
         # Save messages for when we need to reset the context
         self._messages = copy.deepcopy(messages)
         self._camera_index = camera_index
@@ -60,180 +79,179 @@ class LocalPresenceProcessor(FrameProcessor):
         self._start_session_delay = start_session_delay
         self._stop_session_delay = stop_session_delay
         self._last_face_count = 0
+        self._worker = worker
+        self._backend_name = backend
+        self._model_path = model_path
+        self._profile = profile
+        self._presence_url = presence_url
 
         # Session tracking
         self._session_active = True
         self._presence_start_time = None  # When faces were first detected
         self._absence_start_time = None   # When faces were last seen
 
-        # Camera and task management
-        self._capture = None
-        self._capture_task = None
+        # Camera worker and the event-loop side of its handoff queue
+        self._camera_thread: CameraDetectionThread | None = None
+        self._camera_process: CameraDetectionProcess | None = None
+        self._presence_client: PresenceServiceClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._results: asyncio.Queue[DetectionResult] | None = None
+        self._result_task = None
         self._running = False
 
-        # Load the Haar Cascade for face detection
-        self._face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        )
-
-        if self._face_cascade.empty():
-            logger.error("Failed to load face detection cascade")
-            raise RuntimeError("Could not load face detection cascade")
+        # Load the face detection backend (the model itself is shared process-wide).
+        # A worker process loads its own copy, and the service does its own detection.
+        self._backend = None
+        if worker == "thread":
+            try:
+                self._backend = create_backend(backend, model_path, profile)
+            except (RuntimeError, ValueError) as e:
+                logger.error(f"Failed to load face detection backend: {e}")
+                raise
 
+        source = presence_url if worker == "service" else f"camera {camera_index}"
         logger.info(
             f"LocalPresenceProcessor initialized "
-            f"(camera: {camera_index}, interval: {check_interval}s, "
+            f"(source: {source}, interval: {check_interval}s, backend: {backend}, "
+            f"worker: {worker}, "
             f"start_delay: {start_session_delay}s, stop_delay: {stop_session_delay}s)"
         )
 
-    def _detect_faces(self, frame: np.ndarray) -> int:
-        """
-        Detect faces in the given image frame.
-
-        Args:
-            frame: OpenCV image frame (numpy array)
-
-        Returns:
-            Number of faces detected
-        """
+    def _on_detection_result(self, result: DetectionResult):
+        """Hand a result from the camera thread over to the event loop."""
         try:
-            if frame is None:
-                return 0
-
-            # Convert to grayscale for face detection
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-            # Detect faces
-            faces = self._face_cascade.detectMultiScale(
-                gray,
-                scaleFactor=1.1,
-                minNeighbors=5,
-                minSize=(30, 30)
-            )
-
-            return len(faces)
-
-        except Exception as e:
-            logger.error(f"Error detecting faces: {e}", exc_info=True)
-            return 0
+            self._loop.call_soon_threadsafe(self._results.put_nowait, result)
+        except RuntimeError:
+            # The loop closed while the thread was finishing its last check
+            pass
 
-    async def _camera_capture_loop(self):
+    async def _result_loop(self):
         """
-        Background task that continuously captures frames from the camera
-        and performs face detection at regular intervals.
+        Background task that applies detection results from the camera worker.
+        The worker does all capture and detection, so this task only ever waits
+        on the handoff queue and never blocks the pipeline.
         """
-        logger.info("Starting camera capture loop")
-
-        # Initialize the webcam
-        self._capture = cv2.VideoCapture(self._camera_index)
+        try:
+            while True:
+                result = await self._results.get()
+                await self._handle_face_count(result.face_count, result.timestamp)
+        except asyncio.CancelledError:
+            logger.info("Detection result loop cancelled")
 
-        if not self._capture.isOpened():
-            logger.error(f"Failed to open camera {self._camera_index}")
-            return
+    async def _handle_face_count(self, face_count: int, current_time: float):
+        """
+        Emit PresenceFrames and start/stop sessions from one detection result.
 
-        last_check_time = 0
+        Args:
+            face_count: Number of faces detected
+            current_time: When the frame was checked (seconds)
+        """
+        # If face count changed, emit a PresenceFrame
+        if face_count != self._last_face_count:
+            logger.info(f"Local face count changed: {self._last_face_count} -> {face_count}")
+            self._last_face_count = face_count
+            presence_frame = PresenceFrame(face_count=face_count)
+            await self.push_frame(presence_frame)
+
+        # Track presence/absence for session management
+        has_faces = face_count > 0
+
+        if has_faces:
+            # Reset absence timer
+            self._absence_start_time = None
+
+            # Start tracking presence if not already
+            if self._presence_start_time is None:
+                self._presence_start_time = current_time
+                logger.debug("Started tracking presence")
+
+            # Check if we should start a session
+            if not self._session_active:
+                presence_duration = current_time - self._presence_start_time
+                if presence_duration >= self._start_session_delay:
+                    logger.info(f"Starting session after {presence_duration:.1f}s of presence")
+                    await self._start_session()
+        else:
+            # Reset presence timer
+            self._presence_start_time = None
 
-        try:
-            while self._running:
-                # Read frame from webcam
-                ret, frame = self._capture.read()
-
-                if not ret:
-                    logger.warning("Failed to capture frame from camera")
-                    await asyncio.sleep(0.1)
-                    continue
-
-                current_time = time.time()
-
-                # Check if it's time to process
-                if current_time - last_check_time >= self._check_interval:
-                    last_check_time = current_time
-
-                    # Detect faces
-                    face_count = self._detect_faces(frame)
-
-                    # If face count changed, emit a PresenceFrame
-                    if face_count != self._last_face_count:
-                        logger.info(f"Local face count changed: {self._last_face_count} -> {face_count}")
-                        self._last_face_count = face_count
-                        presence_frame = PresenceFrame(face_count=face_count)
-                        await self.push_frame(presence_frame)
-
-                    # Track presence/absence for session management
-                    has_faces = face_count > 0
-
-                    if has_faces:
-                        # Reset absence timer
-                        self._absence_start_time = None
-
-                        # Start tracking presence if not already
-                        if self._presence_start_time is None:
-                            self._presence_start_time = current_time
-                            logger.debug("Started tracking presence")
-
-                        # Check if we should start a session
-                        if not self._session_active:
-                            presence_duration = current_time - self._presence_start_time
-                            if presence_duration >= self._start_session_delay:
-                                logger.info(f"Starting session after {presence_duration:.1f}s of presence")
-                                await self._start_session()
-                    else:
-                        # Reset presence timer
-                        self._presence_start_time = None
-
-                        # Start tracking absence if session is active
-                        if self._session_active:
-                            if self._absence_start_time is None:
-                                self._absence_start_time = current_time
-                                logger.debug("Started tracking absence")
-
-                            # Check if we should stop the session
-                            absence_duration = current_time - self._absence_start_time
-                            if absence_duration >= self._stop_session_delay:
-                                logger.info(f"Stopping session after {absence_duration:.1f}s of absence")
-                                self._absence_start_time = None
-                                await self._stop_session()
-                # Small sleep to prevent CPU spinning
-                await asyncio.sleep(0.01)
+            # Start tracking absence if session is active
+            if self._session_active:
+                if self._absence_start_time is None:
+                    self._absence_start_time = current_time
+                    logger.debug("Started tracking absence")
 
-        except asyncio.CancelledError:
-            logger.info("Camera capture loop cancelled")
-        except Exception as e:
-            logger.error(f"Error in camera capture loop: {e}", exc_info=True)
-        finally:
-            if self._capture:
-                self._capture.release()
-                self._capture = None
-            logger.info("Camera capture loop stopped")
+                # Check if we should stop the session
+                absence_duration = current_time - self._absence_start_time
+                if absence_duration >= self._stop_session_delay:
+                    logger.info(f"Stopping session after {absence_duration:.1f}s of absence")
+                    self._absence_start_time = None
+                    await self._stop_session()
 
     async def _start_capture(self):
-        """Start the camera capture task."""
+        """Start the camera worker and the task that applies its results."""
         if self._running:
             logger.warning("Camera capture already running")
             return
 
         self._running = True
-        self._capture_task = asyncio.create_task(self._camera_capture_loop())
+        self._loop = asyncio.get_running_loop()
+        self._results = asyncio.Queue()
+        self._result_task = asyncio.create_task(self._result_loop())
+        if self._worker == "service":
+            self._presence_client = PresenceServiceClient(
+                self._presence_url,
+                self._check_interval,
+                on_result=self._results.put_nowait,
+            )
+            await self._presence_client.start()
+        elif self._worker == "process":
+            self._camera_process = CameraDetectionProcess(
+                self._camera_index,
+                self._check_interval,
+                self._backend_name,
+                self._model_path,
+                self._profile,
+                on_result=self._results.put_nowait,
+            )
+            await self._camera_process.start()
+        else:
+            self._camera_thread = CameraDetectionThread(
+                self._camera_index,
+                self._check_interval,
+                self._backend,
+                on_result=self._on_detection_result,
+            )
+            self._camera_thread.start()
         logger.info("Camera capture started")
 
     async def _stop_capture(self):
-        """Stop the camera capture task."""
+        """Stop the camera worker and the result task."""
         if not self._running:
             return
 
         self._running = False
 
-        if self._capture_task:
-            self._capture_task.cancel()
+        if self._presence_client:
+            await self._presence_client.stop()
+            self._presence_client = None
+
+        if self._camera_process:
+            await self._camera_process.stop()
+            self._camera_process = None
+
+        if self._camera_thread:
+            # Joining the thread waits for the camera to be released
+            await asyncio.to_thread(self._camera_thread.stop)
+            self._camera_thread = None
+
+        if self._result_task:
+            self._result_task.cancel()
             try:
-                await self._capture_task
+                await self._result_task
             except asyncio.CancelledError:
                 pass
-            self._capture_task = None
-
-        if self._capture:
-            self._capture.release()
-            self._capture = None
+            self._result_task = None
 
         # Reset session state
         self._session_active = False
@@ -0,0 +1,138 @@
+#
+# Copyright (c) 2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import json
+import random
+import time
+from typing import Callable
+
+import aiohttp
+from loguru import logger
+
+from facedetect import DetectionResult
+
+
+class PresenceServiceClient:
+    """
+    Follows the presence service's /ws feed instead of opening a camera.
+
+    Merges the service's "status" and "delta" messages into its current state
+    and hands the face count to on_result as a DetectionResult. While the feed
+    is quiet (the service only sends changes and heartbeats), the last known
+    count is re-reported every check_interval so time-based session logic
+    keeps advancing. Reconnects with exponential backoff and jitter.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        check_interval: float,
+        on_result: Callable[[DetectionResult], None],
+        min_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            url: Presence service WebSocket URL, e.g. ws://localhost:8765/ws
+            check_interval: Seconds between re-reports of an unchanged face count
+            on_result: Called on the event loop with each result
+            min_backoff: First reconnect delay in seconds
+            max_backoff: Longest reconnect delay in seconds
+        """
+        self._url = url
+        self._check_interval = check_interval
+        self._on_result = on_result
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._status: dict = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Start following the service."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Disconnect and stop reconnecting."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        backoff = self._min_backoff
+        async with aiohttp.ClientSession() as session:
+            while True:
+                try:
+                    async with session.ws_connect(self._url, heartbeat=30) as ws:
+                        logger.info(f"Connected to presence service at {self._url}")
+                        backoff = self._min_backoff
+                        await self._follow(ws)
+                    logger.warning("Presence service closed the connection")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Presence service connection failed: {e}")
+
+                # Forget the state: the next connection starts with a full status
+                self._status = {}
+                delay = backoff * random.uniform(0.5, 1.0)
+                logger.info(f"Reconnecting to presence service in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                backoff = min(self._max_backoff, backoff * 2)
+
+    async def _follow(self, ws: aiohttp.ClientWebSocketResponse):
+        """Apply messages from one connection until it closes."""
+        while True:
+            try:
+                msg = await ws.receive(timeout=self._check_interval)
+            except asyncio.TimeoutError:
+                # Quiet feed: re-report the last known state
+                self._report()
+                continue
+
+            if msg.type == aiohttp.WSMsgType.TEXT:
+                self._apply(json.loads(msg.data))
+            elif msg.type in (
+                aiohttp.WSMsgType.CLOSE,
+                aiohttp.WSMsgType.CLOSING,
+                aiohttp.WSMsgType.CLOSED,
+                aiohttp.WSMsgType.ERROR,
+            ):
+                return
+
+    def _apply(self, message: dict):
+        """Merge one presence message into the current state."""
+        message_type = message.pop("type", None)
+        if message_type == "status":
+            self._status = message
+        elif message_type == "delta":
+            if not self._status:
+                # A delta without a base status cannot be applied; wait for one
+                return
+            self._status.update(message)
+        # Heartbeats carry no state, but they still mark a check
+        self._report()
+
+    def _report(self):
+        status = self._status
+        if not status or not status.get("available") or status.get("error"):
+            # No usable state from the service: report nothing rather than "absent"
+            return
+        self._on_result(
+            DetectionResult(face_count=status.get("face_count", 0), timestamp=time.time())
+        )
@@ -5,14 +5,20 @@
 #
 
 from pipecat.frames.frames import Frame
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
 class PresenceFrame(Frame):
-    """Frame that indicates the number of faces detected in the video stream."""
+    """
+    Frame that indicates the number of faces detected in the video stream.
+
+    For remote video, face_count is the room total and participants holds the
+    count per participant user_id; it is empty for the local camera.
+    """
 
     face_count: int = 0
+    participants: dict[str, int] = field(default_factory=dict)
 
     def __post_init__(self):
         super().__post_init__()
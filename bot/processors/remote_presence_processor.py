@@ -4,44 +4,138 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
+import asyncio
 import time
-import cv2
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 from loguru import logger
 
 from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
     Frame,
     InputImageRawFrame,
+    StartFrame,
     UserAudioRawFrame
 )
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 
+from facedetect import create_backend, frame_from_raw
+
 from .presence_frame import PresenceFrame
 
 
+@dataclass(frozen=True)
+class VideoSamplingPolicy:
+    """The video a participant needs to send for presence detection."""
+
+    framerate: int
+    max_quality: str  # Daily receive layer: "low", "medium" or "high"
+
+
+@dataclass
+class _Participant:
+    """Detection state for one remote participant's video."""
+
+    latest_frame: InputImageRawFrame | None = None
+    face_count: int = 0
+    next_check: float = 0.0
+    last_seen: float = 0.0
+    boost_until: float = 0.0
+    policy: VideoSamplingPolicy | None = None
+
+
 class RemotePresenceProcessor(FrameProcessor):
     """
     Monitors InputImageRawFrame objects from remote participants for face detection.
-    Checks for faces every second and emits a PresenceFrame when the count changes.
+    Tracks a face count per participant (keyed by the frame's user_id) and emits a
+    PresenceFrame with the room total whenever it changes.
+
+    Incoming images only replace the frame in their participant's single-slot
+    mailbox; a background task runs detection on the newest one in a worker
+    thread. Stale frames are dropped instead of queued, so the pipeline never
+    waits on a cascade scan, whatever the image size.
+
+    Each participant is checked at most once per check interval, and all of them
+    together at most max_detections_per_second times: in a larger room every
+    participant is simply checked less often, so CPU stays flat as people join.
+
+    The processor also works out the video it needs from each participant, a
+    low-quality stream at the rate it actually checks, raised for a few seconds
+    after their face count changes to settle the transition quickly. It fires
+    "on_sampling_policy_changed" with (user_id, VideoSamplingPolicy) so the
+    transport only decodes and ships frames that will be looked at.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        backend: str = "haar",
+        model_path: str | None = None,
+        profile: str | None = None,
+        check_interval: float = 1.0,
+        max_detections_per_second: float = 4.0,
+        participant_timeout: float = 10.0,
+        max_quality: str = "low",
+        transition_framerate: int = 4,
+        transition_quality: str = "medium",
+        transition_hold: float = 3.0,
+    ):
+        """
+        Initialize the remote presence processor.
+
+        Args:
+            backend: Detection backend name: haar, lbp, yunet or ssd (default: haar)
+            model_path: Local model file for the backend (default: backend search)
+            profile: Cascade parameter profile, e.g. "pi" (default: "default")
+            check_interval: Shortest time between checks of one participant (default: 1.0)
+            max_detections_per_second: Cap on detections across all participants
+                (default: 4.0)
+            participant_timeout: Seconds without video after which a participant's
+                faces stop counting towards the room (default: 10.0)
+            max_quality: Video quality requested between transitions (default: "low")
+            transition_framerate: Frame rate requested right after a participant's
+                face count changes (default: 4)
+            transition_quality: Video quality requested during transitions
+                (default: "medium")
+            transition_hold: Seconds a transition keeps the raised rate (default: 3.0)
+        """
         super().__init__()
-        self._last_check_time = 0
-        self._check_interval = 1.0  # Check every 1 second
+        self._check_interval = check_interval
+        self._min_detection_gap = 1.0 / max_detections_per_second
+        self._participant_timeout = participant_timeout
+        self._max_quality = max_quality
+        self._transition_framerate = transition_framerate
+        self._transition_quality = transition_quality
+        self._transition_hold = transition_hold
         self._last_face_count = 0
 
-        # Load the Haar Cascade for face detection
-        self._face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        # Per-participant "latest frame" mailboxes drained by the detection task
+        self._participants: dict[str, _Participant] = {}
+        self._frame_available = asyncio.Event()
+        self._detection_task: asyncio.Task | None = None
+        # Between StartFrame and EndFrame/CancelFrame
+        self._running = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="remote-presence"
         )
+        self._dropped_frames = 0
 
-        if self._face_cascade.empty():
-            logger.error("Failed to load face detection cascade")
-            raise RuntimeError("Could not load face detection cascade")
+        self._register_event_handler("on_sampling_policy_changed")
 
-        logger.info("RemotePresenceProcessor initialized with face detection")
+        # Load the face detection backend (the model itself is shared process-wide)
+        try:
+            self._backend = create_backend(backend, model_path, profile)
+        except (RuntimeError, ValueError) as e:
+            logger.error(f"Failed to load face detection backend: {e}")
+            raise
+
+        logger.info(f"RemotePresenceProcessor initialized with {backend} face detection")
+
+    @property
+    def face_counts(self) -> dict[str, int]:
+        """Latest face count per participant."""
+        return {user_id: p.face_count for user_id, p in self._participants.items()}
 
     def _detect_faces(self, frame: InputImageRawFrame) -> int:
         """
@@ -54,85 +148,213 @@ class RemotePresenceProcessor(FrameProcessor):
             Number of faces detected
         """
         try:
-            image_bytes = frame.image
-            size = frame.size
-            format_str = frame.format
-
-            # Convert bytes to numpy array
-            nparr = np.frombuffer(image_bytes, np.uint8)
-
-            # Try to decode as encoded image (JPEG, PNG, etc.)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-            # If decoding failed, assume it's raw pixel data
-            if img is None:
-                width, height = size
-
-                # Determine the format and reshape accordingly
-                # Most common formats: RGB24, BGR24, RGBA, BGRA
-                if format_str and 'RGB' in format_str.upper():
-                    # RGB format - need to determine if it has alpha channel
-                    if 'RGBA' in format_str.upper() or len(image_bytes) == width * height * 4:
-                        img = np.frombuffer(image_bytes, dtype=np.uint8).reshape((height, width, 4))
-                        img = cv2.cvtColor(img, cv2.COLOR_RGBA2BGR)
-                    else:
-                        img = np.frombuffer(image_bytes, dtype=np.uint8).reshape((height, width, 3))
-                        img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-                else:
-                    # Assume BGR format (OpenCV default)
-                    bytes_per_pixel = len(image_bytes) // (width * height)
-                    if bytes_per_pixel == 4:
-                        img = np.frombuffer(image_bytes, dtype=np.uint8).reshape((height, width, 4))
-                        img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-                    else:
-                        img = np.frombuffer(image_bytes, dtype=np.uint8).reshape((height, width, 3))
+            # Straight to what the backend consumes (gray for cascades), without
+            # trying to decode raw pixels or building an intermediate BGR copy
+            img = frame_from_raw(
+                frame.image, frame.size, frame.format, self._backend.grayscale
+            )
 
             if img is None:
                 logger.warning("Failed to process image")
                 return 0
 
-            # Convert to grayscale for face detection
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-            # Detect faces
-            faces = self._face_cascade.detectMultiScale(
-                gray,
-                scaleFactor=1.1,
-                minNeighbors=5,
-                minSize=(30, 30)
-            )
-
-            return len(faces)
+            return len(self._backend.detect(img))
 
         except Exception as e:
             logger.error(f"Error detecting faces: {e}", exc_info=True)
             return 0
 
+    def _participant_interval(
+        self, participant: _Participant, now: float, room_size: int | None = None
+    ) -> float:
+        """Per-participant check interval: its own budget within the room's share."""
+        if room_size is None:
+            room_size = len(self._participants)
+        room_share = room_size * self._min_detection_gap
+        if now < participant.boost_until:
+            return max(1.0 / self._transition_framerate, room_share)
+        return max(self._check_interval, room_share)
+
+    def _policy_for(
+        self, participant: _Participant, now: float, room_size: int | None = None
+    ) -> VideoSamplingPolicy:
+        framerate = max(1, round(1.0 / self._participant_interval(participant, now, room_size)))
+        if now < participant.boost_until:
+            return VideoSamplingPolicy(framerate, self._transition_quality)
+        return VideoSamplingPolicy(framerate, self._max_quality)
+
+    def sampling_policy(self, user_id: str) -> VideoSamplingPolicy:
+        """
+        The video this processor currently needs from a participant.
+
+        Args:
+            user_id: Participant id (for a participant not seen yet: the policy
+                they will get once their video arrives)
+
+        Returns:
+            Frame rate and quality to request from the transport
+        """
+        now = time.monotonic()
+        participant = self._participants.get(user_id)
+        if participant is None:
+            return self._policy_for(_Participant(), now, len(self._participants) + 1)
+        return self._policy_for(participant, now)
+
+    async def _update_sampling_policies(self, now: float):
+        """Fire on_sampling_policy_changed for participants whose needs changed."""
+        for user_id, participant in list(self._participants.items()):
+            policy = self._policy_for(participant, now)
+            if policy != participant.policy:
+                logger.debug(f"Sampling policy for {user_id!r}: {policy}")
+                participant.policy = policy
+                await self._call_event_handler("on_sampling_policy_changed", user_id, policy)
+
+    def _next_due(self, now: float) -> tuple[_Participant | None, float | None]:
+        """
+        Pick the most overdue participant with a pending frame.
+
+        Returns:
+            (participant, None) if one is due, else (None, seconds until the next
+            pending frame is due, or None if no frame is pending)
+        """
+        pending = [p for p in self._participants.values() if p.latest_frame is not None]
+        if not pending:
+            return None, None
+        participant = min(pending, key=lambda p: p.next_check)
+        if participant.next_check <= now:
+            return participant, None
+        return None, participant.next_check - now
+
+    async def _expire_participants(self, now: float):
+        """Forget participants whose video stopped, then refresh the room count."""
+        for user_id, participant in list(self._participants.items()):
+            if now - participant.last_seen >= self._participant_timeout:
+                logger.debug(f"No video from participant {user_id!r}, forgetting them")
+                del self._participants[user_id]
+        await self._update_room_presence()
+        await self._update_sampling_policies(now)
+
+    async def _update_room_presence(self):
+        """Emit a PresenceFrame if the room-wide face count changed."""
+        face_count = sum(p.face_count for p in self._participants.values())
+        if face_count != self._last_face_count:
+            logger.info(f"Face count changed: {self._last_face_count} -> {face_count}")
+            self._last_face_count = face_count
+            presence_frame = PresenceFrame(
+                face_count=face_count, participants=self.face_counts
+            )
+            logger.info(f"Emitting presence frame: {presence_frame}")
+            await self.push_frame(presence_frame)
+
+    async def _detection_loop(self):
+        """
+        Background task that detects faces in the newest frame of whichever
+        participant is most overdue, within the per-participant and room-wide
+        budgets, and emits a PresenceFrame when the room count changes.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                now = time.monotonic()
+                await self._expire_participants(now)
+                participant, wait = self._next_due(now)
+                if participant is None:
+                    # Nothing due: sleep until something is, a new frame arrives,
+                    # a silent participant times out or a transition ends
+                    deadlines = []
+                    for p in self._participants.values():
+                        deadlines.append(p.last_seen + self._participant_timeout)
+                        if p.boost_until > now:
+                            deadlines.append(p.boost_until)
+                    if deadlines:
+                        expiry = min(deadlines) - now
+                        wait = expiry if wait is None else min(wait, expiry)
+                    self._frame_available.clear()
+                    try:
+                        await asyncio.wait_for(self._frame_available.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                frame, participant.latest_frame = participant.latest_frame, None
+                face_count = await loop.run_in_executor(
+                    self._executor, self._detect_faces, frame
+                )
+                now = time.monotonic()
+                if face_count != participant.face_count:
+                    # Look closer for a while so the change settles quickly
+                    participant.boost_until = now + self._transition_hold
+                participant.face_count = face_count
+                participant.next_check = now + self._participant_interval(participant, now)
+                await self._update_room_presence()
+                await self._update_sampling_policies(now)
+
+                # Room-wide cap; frames arriving meanwhile replace each other
+                await asyncio.sleep(self._min_detection_gap)
+        except asyncio.CancelledError:
+            logger.debug(f"Remote detection stopped ({self._dropped_frames} frames dropped)")
+            raise
+
+    def _start_detection(self):
+        self._running = True
+        if not self._detection_task or self._detection_task.done():
+            self._detection_task = asyncio.create_task(self._detection_loop())
+
+    async def _stop_detection(self):
+        self._running = False
+        if self._detection_task:
+            self._detection_task.cancel()
+            try:
+                await self._detection_task
+            except asyncio.CancelledError:
+                pass
+            self._detection_task = None
+        for participant in self._participants.values():
+            participant.latest_frame = None
+        self._frame_available.clear()
+
+    async def remove_participant(self, user_id: str):
+        """Stop counting a participant who left the room."""
+        if self._participants.pop(user_id, None) is not None:
+            await self._update_room_presence()
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
+        if isinstance(frame, StartFrame):
+            self._start_detection()
+        elif isinstance(frame, (EndFrame, CancelFrame)):
+            await self._stop_detection()
+
         if not isinstance(frame, UserAudioRawFrame):
             logger.debug(f"Got frame: {frame}")
 
         if isinstance(frame, InputImageRawFrame):
-            logger.info(f"Got Input Image Raw Frame: size={frame.size}, format={frame.format}")
-            current_time = time.time()
+            logger.debug(f"Got Input Image Raw Frame: size={frame.size}, format={frame.format}")
+            if not self._running:
+                # Video still arriving after the pipeline stopped is not checked
+                return
 
-            # Check if enough time has passed since last check
-            if current_time - self._last_check_time >= self._check_interval:
-                self._last_check_time = current_time
-
-                # Detect faces in the image
-                face_count = self._detect_faces(frame)
-
-                # If face count changed, emit a PresenceFrame
-                if face_count != self._last_face_count:
-                    logger.info(f"Face count changed: {self._last_face_count} -> {face_count}")
-                    self._last_face_count = face_count
-                    presence_frame = PresenceFrame(face_count=face_count)
-                    logger.info(f"Emitting presence frame: {presence_frame}")
-                    await self.push_frame(presence_frame)
+            # Hand the frame to the detection task; an unprocessed older one from
+            # the same participant is dropped
+            user_id = getattr(frame, "user_id", None) or ""
+            participant = self._participants.get(user_id)
+            if participant is None:
+                # The transport was told this participant's policy before joining
+                participant = self._participants[user_id] = _Participant()
+                participant.policy = self._policy_for(participant, time.monotonic())
+            if participant.latest_frame is not None:
+                self._dropped_frames += 1
+            participant.latest_frame = frame
+            participant.last_seen = time.monotonic()
+            self._frame_available.set()
 
         else:
             # Put this in an 'else' for now so we eat image frames and don't pass them to the model
             await self.push_frame(frame, direction)
+
+    async def cleanup(self):
+        """Cleanup method called when processor is being destroyed."""
+        await self._stop_detection()
+        self._executor.shutdown(wait=False)
+        await super().cleanup()
@@ -4,31 +4,137 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
+import asyncio
+from collections import deque
+
+from loguru import logger
+
 from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
     Frame,
     LLMFullResponseEndFrame,
     LLMFullResponseStartFrame,
     LLMTextFrame,
     LLMContextFrame,
+    LLMConfigureOutputFrame,
+    StartFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
 )
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 
+from .audio_cache import AudioCache, Synthesizer
+
+# Seconds of audio per pushed frame when playing pre-synthesised lines
+_CHUNK_SECONDS = 0.5
+
 
 class ScriptProcessor(FrameProcessor):
     """
     Accepts a list of strings to use as fixed responses in a scripted conversation. Include "None" elements to allow the LLM to respond during that turn. LLM responses will take over after the script list is complete.
+
+    With an audio cache, every line is loaded from the cache (or synthesised
+    into it) when the pipeline starts and played back as audio frames directly,
+    skipping the LLM and TTS round-trips. Lines whose audio is not ready yet
+    still go through TTS.
     """
 
-    def __init__(self, script: list[str | None]):
+    def __init__(
+        self,
+        script: list[str | None],
+        audio_cache: AudioCache | None = None,
+        voice_id: str | None = None,
+        synthesize: Synthesizer | None = None,
+    ):
+        """
+        Initialize the script processor.
+
+        Args:
+            script: Scripted lines, None for turns the LLM answers
+            audio_cache: Cache of pre-synthesised lines (default: always use TTS)
+            voice_id: Voice the lines are spoken in (the TTS service's voice)
+            synthesize: Fills the cache for lines missing from it (default: only
+                play lines already cached)
+        """
         super().__init__()
-        self._script = script
+        self._script = deque(script)
+        self._audio_cache = audio_cache
+        self._voice_id = voice_id
+        self._synthesize = synthesize
+        self._line_audio: dict[str, bytes] = {}
+        self._sample_rate = 0
+        self._prepare_task: asyncio.Task | None = None
+
+    async def _prepare_audio(self, lines: list[str]):
+        """Load or synthesise each line's audio, in script order."""
+        for line in lines:
+            audio = await asyncio.to_thread(
+                self._audio_cache.get, line, self._voice_id, self._sample_rate
+            )
+            if audio is None and self._synthesize:
+                try:
+                    audio = await self._synthesize(line, self._voice_id, self._sample_rate)
+                except Exception as e:
+                    logger.warning(f"Failed to synthesise script line {line!r}: {e}")
+                    continue
+                await asyncio.to_thread(
+                    self._audio_cache.put, line, self._voice_id, self._sample_rate, audio
+                )
+            if audio:
+                self._line_audio[line] = audio
+        logger.debug(f"Script audio ready for {len(self._line_audio)}/{len(lines)} lines")
+
+    async def _play_line(self, line: str, audio: bytes):
+        """Speak a line from its pre-synthesised audio, bypassing the TTS service."""
+        # An LLM service downstream stamps its own skip_tts on the response
+        # frames it passes on, so switch it to skipping TTS for this line
+        await self.push_frame(LLMConfigureOutputFrame(skip_tts=True))
+        start_frame = LLMFullResponseStartFrame()
+        start_frame.skip_tts = True
+        await self.push_frame(start_frame)
+
+        await self.push_frame(TTSStartedFrame())
+        chunk_size = int(self._sample_rate * _CHUNK_SECONDS) * 2
+        for offset in range(0, len(audio), chunk_size):
+            await self.push_frame(
+                TTSAudioRawFrame(
+                    audio=audio[offset : offset + chunk_size],
+                    sample_rate=self._sample_rate,
+                    num_channels=1,
+                )
+            )
+        await self.push_frame(TTSStoppedFrame())
+
+        # The text still reaches the assistant context, but not the TTS service
+        text_frame = LLMTextFrame(text=line)
+        text_frame.skip_tts = True
+        await self.push_frame(text_frame)
+        end_frame = LLMFullResponseEndFrame()
+        end_frame.skip_tts = True
+        await self.push_frame(end_frame)
+        await self.push_frame(LLMConfigureOutputFrame(skip_tts=False))
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
-        if isinstance(frame, LLMContextFrame):
+        if isinstance(frame, StartFrame):
+            if self._audio_cache and self._voice_id:
+                self._sample_rate = frame.audio_out_sample_rate
+                lines = list(dict.fromkeys(line for line in self._script if line))
+                self._prepare_task = self.create_task(self._prepare_audio(lines))
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, (EndFrame, CancelFrame)):
+            if self._prepare_task:
+                await self.cancel_task(self._prepare_task)
+                self._prepare_task = None
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, LLMContextFrame):
             if len(self._script) > 0:
-                this_line = self._script.pop(0)
-                if this_line:
+                this_line = self._script.popleft()
+                if this_line and this_line in self._line_audio:
+                    await self._play_line(this_line, self._line_audio[this_line])
+                elif this_line:
                     await self.push_frame(LLMFullResponseStartFrame())
                     await self.push_frame(LLMTextFrame(text=this_line))
                     await self.push_frame(LLMFullResponseEndFrame())
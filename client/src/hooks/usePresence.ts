@@ -1,7 +1,8 @@
-import { useEffect } from 'react';
+import { useEffect, useState } from 'react';
 import useWebSocket, { ReadyState } from 'react-use-websocket';
 
 interface PresenceData {
+  available: boolean;
   present: boolean;
   face_count: number;
   last_update: string | null;
@@ -9,6 +10,13 @@ interface PresenceData {
   camera_index: number;
 }
 
+// The service sends a full "status" on connect, then "delta" messages with
+// only the changed fields, and periodic "heartbeat" messages
+type PresenceMessage =
+  | ({ type: 'status' } & PresenceData)
+  | ({ type: 'delta' } & Partial<PresenceData>)
+  | { type: 'heartbeat'; last_update: string | null };
+
 interface UsePresenceOptions {
   url?: string;
   autoConnect?: boolean;
@@ -16,8 +24,9 @@ interface UsePresenceOptions {
 
 export function usePresence(options: UsePresenceOptions = {}) {
   const { url = 'ws://localhost:8765/ws', autoConnect = true } = options;
+  const [presenceData, setPresenceData] = useState<PresenceData | null>(null);
 
-  const { lastJsonMessage, readyState } = useWebSocket<PresenceData>(
+  const { lastJsonMessage, readyState } = useWebSocket<PresenceMessage>(
     autoConnect ? url : null,
     {
       shouldReconnect: () => true,
@@ -29,13 +38,23 @@ export function usePresence(options: UsePresenceOptions = {}) {
   const isConnected = readyState === ReadyState.OPEN;
 
   useEffect(() => {
-    if (lastJsonMessage) {
-      console.log('[Presence] Update:', {
-        present: lastJsonMessage.present,
-        faces: lastJsonMessage.face_count,
-        timestamp: lastJsonMessage.last_update,
-      });
+    if (!lastJsonMessage || lastJsonMessage.type === 'heartbeat') {
+      return;
     }
+
+    const { type, ...fields } = lastJsonMessage;
+    setPresenceData((previous) =>
+      type === 'status'
+        ? (fields as PresenceData)
+        : previous && { ...previous, ...fields }
+    );
+
+    console.log('[Presence] Update:', {
+      type,
+      present: fields.present,
+      faces: fields.face_count,
+      timestamp: fields.last_update,
+    });
   }, [lastJsonMessage]);
 
   useEffect(() => {
@@ -48,8 +67,8 @@ export function usePresence(options: UsePresenceOptions = {}) {
 
   return {
     isConnected,
-    presenceData: lastJsonMessage,
-    isPresent: lastJsonMessage?.present ?? false,
-    faceCount: lastJsonMessage?.face_count ?? 0,
+    presenceData,
+    isPresent: presenceData?.present ?? false,
+    faceCount: presenceData?.face_count ?? 0,
   };
 }
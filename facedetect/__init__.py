@@ -0,0 +1,46 @@
+"""
+Shared face detection package for the presence service and bot processors.
+"""
+
+from .backends import (
+    BACKENDS,
+    DetectionBackend,
+    Face,
+    HaarBackend,
+    LBPBackend,
+    SSDBackend,
+    YuNetBackend,
+    create_backend,
+    detect,
+)
+from .cache import clear_cache
+from .cascades import CV2_AVAILABLE, find_cascade_file
+from .image import frame_from_raw, to_bgr, to_gray
+from .motion import MotionGate
+from .profiles import PROFILES, get_profile
+from .tracking import FaceTracker
+from .worker import DetectionResult, run_camera_detection
+
+__all__ = [
+    "BACKENDS",
+    "CV2_AVAILABLE",
+    "DetectionBackend",
+    "DetectionResult",
+    "Face",
+    "FaceTracker",
+    "HaarBackend",
+    "LBPBackend",
+    "MotionGate",
+    "PROFILES",
+    "SSDBackend",
+    "YuNetBackend",
+    "clear_cache",
+    "create_backend",
+    "detect",
+    "find_cascade_file",
+    "frame_from_raw",
+    "get_profile",
+    "run_camera_detection",
+    "to_bgr",
+    "to_gray",
+]
@@ -0,0 +1,9 @@
+"""
+Entry point for ``python -m facedetect``: the camera detection worker process.
+"""
+
+import sys
+
+from .worker import main
+
+sys.exit(main())
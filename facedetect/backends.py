@@ -0,0 +1,418 @@
+"""
+Pluggable face detection backends.
+
+Every backend takes a BGR or grayscale frame and returns a list of Face
+boxes, and keeps a running record of how long each frame took so the
+cheapest backend that meets recall on a given device can be picked.
+
+Model files are always loaded from local paths so detection works offline,
+and each file is parsed once per process (see cache.py).
+"""
+
+import math
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from .cache import load_shared
+from .cascades import CV2_AVAILABLE, cv2, find_cascade_file
+from .image import to_bgr, to_gray
+from .profiles import get_profile
+
+# Default location for downloaded DNN models (see facedetect/README.md)
+DEFAULT_MODELS_DIR = os.getenv(
+    "FACEDETECT_MODELS_DIR", str(Path(__file__).parent / "models")
+)
+
+
+@dataclass
+class Face:
+    """
+    A detected face bounding box in frame pixel coordinates.
+
+    score is the detector's confidence in [0, 1]: the network's confidence for
+    the DNN backends, and for cascades the logistic of how far the final stage
+    was passed, which ranks cascade hits but is not comparable across backends.
+    """
+
+    x: int
+    y: int
+    w: int
+    h: int
+    score: float = 1.0
+
+
+class DetectionBackend:
+    """
+    Base class for face detection backends.
+
+    Subclasses implement _detect() (and optionally _detect_batch()); callers
+    use detect() or detect_batch(), which also record the per-frame cost.
+    """
+
+    name = "base"
+    # Cascades work on grayscale; DNN backends want BGR (see image.frame_from_raw)
+    grayscale = False
+    # Smallest face width in pixels this backend can find (0: no fixed floor)
+    min_face_width = 0
+
+    def __init__(self):
+        if not CV2_AVAILABLE:
+            raise RuntimeError("OpenCV (cv2) is not available")
+
+        self._frames = 0
+        self._total_ms = 0.0
+        self._last_ms = 0.0
+
+    def _detect(self, frame) -> list[Face]:
+        raise NotImplementedError
+
+    def _detect_batch(self, frames) -> list[list[Face]]:
+        return [self._detect(frame) for frame in frames]
+
+    def _record(self, elapsed_ms: float, frames: int):
+        self._last_ms = elapsed_ms / frames
+        self._total_ms += elapsed_ms
+        self._frames += frames
+
+    def detect(self, frame) -> list[Face]:
+        """
+        Detect faces in the given frame.
+
+        Args:
+            frame: BGR (H, W, 3) or grayscale (H, W) image
+
+        Returns:
+            List of detected faces
+        """
+        start = time.perf_counter()
+        faces = self._detect(frame)
+        self._record((time.perf_counter() - start) * 1000, 1)
+        return faces
+
+    def detect_batch(self, frames) -> list[list[Face]]:
+        """
+        Detect faces in several frames at once.
+
+        Args:
+            frames: Sequence of BGR or grayscale images
+
+        Returns:
+            One list of detected faces per input frame
+        """
+        if not frames:
+            return []
+
+        start = time.perf_counter()
+        results = self._detect_batch(frames)
+        self._record((time.perf_counter() - start) * 1000, len(frames))
+        return results
+
+    def cost(self) -> dict:
+        """
+        Get the per-frame cost of this backend.
+
+        Returns:
+            Dictionary with backend name, frames processed, last and average ms
+        """
+        avg_ms = self._total_ms / self._frames if self._frames else 0.0
+        return {
+            "backend": self.name,
+            "frames": self._frames,
+            "last_ms": round(self._last_ms, 2),
+            "avg_ms": round(avg_ms, 2),
+        }
+
+
+class HaarBackend(DetectionBackend):
+    """OpenCV Haar Cascade classifier (the original detector)."""
+
+    name = "haar"
+    grayscale = True
+    default_cascade = "haarcascade_frontalface_default.xml"
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        scale_factor: float = 1.1,
+        min_neighbors: int = 5,
+        min_size: tuple[int, int] = (30, 30),
+    ):
+        """
+        Initialize the cascade backend.
+
+        Args:
+            model_path: Path to the cascade XML (default: search common locations)
+            scale_factor: Pyramid scale step passed to detectMultiScale
+            min_neighbors: Neighbor count required to keep a candidate
+            min_size: Smallest face size in pixels
+        """
+        super().__init__()
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = min_size
+
+        cascade_path = model_path or find_cascade_file(
+            self.default_cascade, models_dir=DEFAULT_MODELS_DIR
+        )
+        if not cascade_path:
+            raise RuntimeError(
+                f"Could not find {self.default_cascade} in common locations"
+            )
+
+        def load():
+            cascade = cv2.CascadeClassifier(cascade_path)
+            if cascade.empty():
+                raise RuntimeError(
+                    f"Could not load face detection cascade from {cascade_path}"
+                )
+            return cascade
+
+        self._shared = load_shared(("cascade", os.path.abspath(cascade_path)), load)
+
+    @property
+    def min_face_width(self) -> int:
+        """Smallest detectable face: min_size, but never below the cascade window."""
+        window_width = self._shared.model.getOriginalWindowSize()[0]
+        return max(self.min_size[0], window_width)
+
+    def _scan(self, gray) -> list[Face]:
+        # Same boxes as detectMultiScale, plus each box's final stage weight
+        rects, _, weights = self._shared.model.detectMultiScale3(
+            gray,
+            scaleFactor=self.scale_factor,
+            minNeighbors=self.min_neighbors,
+            minSize=self.min_size,
+            outputRejectLevels=True,
+        )
+        return [
+            Face(int(x), int(y), int(w), int(h), 1.0 / (1.0 + math.exp(-weight)))
+            for (x, y, w, h), weight in zip(rects, weights)
+        ]
+
+    def _detect(self, frame) -> list[Face]:
+        gray = to_gray(frame)
+        with self._shared.lock:
+            return self._scan(gray)
+
+    def _detect_batch(self, frames) -> list[list[Face]]:
+        grays = [to_gray(frame) for frame in frames]
+        with self._shared.lock:
+            return [self._scan(gray) for gray in grays]
+
+
+class LBPBackend(HaarBackend):
+    """
+    OpenCV LBP cascade classifier.
+
+    Integer features make this several times cheaper than Haar on ARM at a
+    small recall cost. pip's opencv-python does not ship LBP cascades, so the
+    XML comes from a system OpenCV install or the local models directory.
+    """
+
+    name = "lbp"
+    default_cascade = "lbpcascade_frontalface_improved.xml"
+
+
+class YuNetBackend(DetectionBackend):
+    """OpenCV DNN face detector (YuNet) via cv2.FaceDetectorYN."""
+
+    name = "yunet"
+    default_model = "face_detection_yunet_2023mar.onnx"
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        score_threshold: float = 0.7,
+        nms_threshold: float = 0.3,
+        top_k: int = 50,
+    ):
+        """
+        Initialize the YuNet backend.
+
+        Args:
+            model_path: Path to the YuNet ONNX model (default: models directory)
+            score_threshold: Minimum face confidence
+            nms_threshold: Non-maximum suppression IoU threshold
+            top_k: Maximum candidates kept before NMS
+        """
+        super().__init__()
+        model_path = model_path or os.path.join(DEFAULT_MODELS_DIR, self.default_model)
+        if not os.path.exists(model_path):
+            raise RuntimeError(f"YuNet model not found at {model_path}")
+
+        key = (
+            "yunet",
+            os.path.abspath(model_path),
+            score_threshold,
+            nms_threshold,
+            top_k,
+        )
+        self._shared = load_shared(
+            key,
+            lambda: cv2.FaceDetectorYN.create(
+                model_path, "", (320, 320), score_threshold, nms_threshold, top_k
+            ),
+        )
+
+    def _detect(self, frame) -> list[Face]:
+        bgr = to_bgr(frame)
+        height, width = bgr.shape[:2]
+
+        with self._shared.lock:
+            if (width, height) != self._shared.input_size:
+                self._shared.input_size = (width, height)
+                self._shared.model.setInputSize(self._shared.input_size)
+            _, faces = self._shared.model.detect(bgr)
+
+        if faces is None:
+            return []
+
+        # Each row is x, y, w, h, five landmark pairs, then the score
+        return [
+            Face(int(f[0]), int(f[1]), int(f[2]), int(f[3]), float(f[14]))
+            for f in faces
+        ]
+
+
+class SSDBackend(DetectionBackend):
+    """OpenCV DNN ResNet-10 SSD face detector (Caffe model)."""
+
+    name = "ssd"
+    default_config = "deploy.prototxt"
+    default_model = "res10_300x300_ssd_iter_140000.caffemodel"
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        config_path: Optional[str] = None,
+        score_threshold: float = 0.6,
+    ):
+        """
+        Initialize the SSD backend.
+
+        Args:
+            model_path: Path to the Caffe weights (default: models directory)
+            config_path: Path to the prototxt (default: next to the weights)
+            score_threshold: Minimum face confidence
+        """
+        super().__init__()
+        model_path = model_path or os.path.join(DEFAULT_MODELS_DIR, self.default_model)
+        config_path = config_path or os.path.join(
+            os.path.dirname(model_path), self.default_config
+        )
+        for path in (model_path, config_path):
+            if not os.path.exists(path):
+                raise RuntimeError(f"SSD model file not found at {path}")
+
+        self.score_threshold = score_threshold
+        self._shared = load_shared(
+            ("ssd", os.path.abspath(config_path), os.path.abspath(model_path)),
+            lambda: cv2.dnn.readNetFromCaffe(config_path, model_path),
+        )
+
+    def _faces_from_rows(self, rows, width, height) -> list[Face]:
+        faces = []
+        for _, _, score, x1, y1, x2, y2 in rows:
+            if score < self.score_threshold:
+                continue
+            x1, x2 = max(0, int(x1 * width)), min(width, int(x2 * width))
+            y1, y2 = max(0, int(y1 * height)), min(height, int(y2 * height))
+            if x2 > x1 and y2 > y1:
+                faces.append(Face(x1, y1, x2 - x1, y2 - y1, float(score)))
+        return faces
+
+    def _detect(self, frame) -> list[Face]:
+        return self._detect_batch([frame])[0]
+
+    def _detect_batch(self, frames) -> list[list[Face]]:
+        bgrs = [to_bgr(frame) for frame in frames]
+
+        # One forward pass for the whole batch
+        blob = cv2.dnn.blobFromImages(
+            [cv2.resize(bgr, (300, 300)) for bgr in bgrs],
+            1.0,
+            (300, 300),
+            (104.0, 177.0, 123.0),
+        )
+        with self._shared.lock:
+            self._shared.model.setInput(blob)
+            detections = self._shared.model.forward()
+
+        # Output is (1, 1, N, 7) rows of image index, class, score and a
+        # normalized box; split it back into per-image results
+        detections = detections.reshape(-1, 7)
+        results = []
+        for index, bgr in enumerate(bgrs):
+            height, width = bgr.shape[:2]
+            rows = detections[detections[:, 0] == index]
+            results.append(self._faces_from_rows(rows, width, height))
+        return results
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (HaarBackend, LBPBackend, YuNetBackend, SSDBackend)
+}
+
+
+def create_backend(
+    name: str = "haar",
+    model_path: Optional[str] = None,
+    profile: Optional[str] = None,
+    **params,
+) -> DetectionBackend:
+    """
+    Create a detection backend by name.
+
+    Backends created for the same model file share one loaded model, so
+    creating several is cheap; each keeps its own cost statistics.
+
+    Args:
+        name: One of "haar", "lbp", "yunet" or "ssd"
+        model_path: Local model file path (default: backend-specific search)
+        profile: Cascade parameter profile from profiles.py (default: "default")
+        **params: Backend-specific tuning parameters (override the profile)
+
+    Returns:
+        A ready-to-use detection backend
+    """
+    backend_class = BACKENDS.get(name.lower())
+    if backend_class is None:
+        raise ValueError(
+            f"Unknown detection backend {name!r} (choose from {', '.join(BACKENDS)})"
+        )
+
+    if issubclass(backend_class, HaarBackend):
+        params = {**get_profile(profile), **params}
+
+    return backend_class(model_path=model_path, **params)
+
+
+def detect(
+    frames,
+    backend: Union[str, DetectionBackend] = "haar",
+    model_path: Optional[str] = None,
+    profile: Optional[str] = None,
+) -> list[list[Face]]:
+    """
+    Detect faces in a batch of frames.
+
+    A thin wrapper over DetectionBackend.detect_batch. Given a backend name, a
+    backend is created for the call; model files are shared (see cache.py), so
+    that is cheap, but keep a backend around to accumulate its cost figures.
+
+    Args:
+        frames: Sequence of BGR or grayscale images
+        backend: A detection backend, or a backend name (default: haar)
+        model_path: Local model file path when creating a backend by name
+        profile: Cascade parameter profile when creating a backend by name
+
+    Returns:
+        One list of detected faces per input frame
+    """
+    if isinstance(backend, str):
+        backend = create_backend(backend, model_path, profile)
+    return backend.detect_batch(frames)
@@ -0,0 +1,50 @@
+"""
+Process-wide cache of loaded detection models.
+
+Parsing a cascade XML or a DNN model is by far the most expensive part of
+constructing a backend, so every backend in the process that asks for the
+same file shares one loaded model. OpenCV detectors keep per-call scratch
+state, so each shared model carries a lock that callers hold while detecting.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class SharedModel:
+    """A loaded model shared by every backend in the process."""
+
+    model: Any
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    input_size: Optional[tuple[int, int]] = None
+
+
+_models: dict[tuple, SharedModel] = {}
+_models_lock = threading.Lock()
+
+
+def load_shared(key: tuple, loader: Callable[[], Any]) -> SharedModel:
+    """
+    Get a shared model, loading it on first use.
+
+    Args:
+        key: Cache key, e.g. (backend name, model path)
+        loader: Called once to load the model if it is not cached yet
+
+    Returns:
+        The shared model entry
+    """
+    with _models_lock:
+        shared = _models.get(key)
+        if shared is None:
+            shared = SharedModel(model=loader())
+            _models[key] = shared
+        return shared
+
+
+def clear_cache():
+    """Drop all cached models (they are reloaded on next use)."""
+    with _models_lock:
+        _models.clear()
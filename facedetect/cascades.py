@@ -0,0 +1,60 @@
+"""
+Locating OpenCV cascade classifier files on disk.
+"""
+
+import os
+from typing import Optional
+
+# Try to import cv2, but gracefully handle if it's not available
+try:
+    import cv2
+
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+    cv2 = None
+
+
+def find_cascade_file(
+    cascade_name: str = "haarcascade_frontalface_default.xml",
+    models_dir: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Find a Haar or LBP Cascade XML file in common locations.
+
+    Args:
+        cascade_name: Name of the cascade file to find
+        models_dir: Extra directory to search first (e.g. a local model cache)
+
+    Returns:
+        Path to the cascade file, or None if not found
+    """
+    if not CV2_AVAILABLE:
+        return None
+
+    # LBP cascades live next to the Haar ones in system installs
+    subdir = "lbpcascades" if cascade_name.startswith("lbp") else "haarcascades"
+
+    # List of common locations to search
+    search_paths = [
+        os.path.join(models_dir, cascade_name) if models_dir else None,
+        # OpenCV's cv2.data.haarcascades path (most common)
+        cv2.data.haarcascades + cascade_name if hasattr(cv2, "data") else None,
+        # Common system paths on Linux
+        f"/usr/share/opencv4/{subdir}/{cascade_name}",
+        f"/usr/local/share/opencv4/{subdir}/{cascade_name}",
+        f"/usr/share/opencv/{subdir}/{cascade_name}",
+        f"/usr/local/share/opencv/{subdir}/{cascade_name}",
+        # Raspberry Pi specific paths
+        f"/usr/share/opencv/data/{subdir}/{cascade_name}",
+        f"/usr/local/share/OpenCV/{subdir}/{cascade_name}",
+        # Conda/virtual environment paths
+        os.path.join(os.path.dirname(cv2.__file__), "data", cascade_name),
+    ]
+
+    # Filter out None values and check each path
+    for path in search_paths:
+        if path and os.path.exists(path):
+            return path
+
+    return None
@@ -0,0 +1,167 @@
+"""
+Frame conversion helpers shared by all detection backends, and the raw
+transport-buffer fast path used for remote video.
+"""
+
+from typing import Optional
+
+from .cascades import cv2
+
+
+def to_gray(frame):
+    """
+    Convert a frame to single-channel grayscale for cascade detection.
+
+    Args:
+        frame: Grayscale (H, W), BGR (H, W, 3) or BGRA (H, W, 4) image
+
+    Returns:
+        Grayscale image (the input itself if it is already grayscale)
+    """
+    if frame.ndim == 2:
+        return frame
+    if frame.shape[2] == 4:
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+def to_bgr(frame):
+    """
+    Convert a frame to 3-channel BGR for DNN detection.
+
+    Args:
+        frame: Grayscale (H, W), BGR (H, W, 3) or BGRA (H, W, 4) image
+
+    Returns:
+        BGR image (the input itself if it is already BGR)
+    """
+    if frame.ndim == 2:
+        return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+    if frame.shape[2] == 4:
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+    return frame
+
+
+# Transport format names (upper case, no separators) to a raw pixel layout
+_RAW_LAYOUTS = {
+    "GRAY": "GRAY",
+    "GRAY8": "GRAY",
+    "L": "GRAY",
+    "Y8": "GRAY",
+    "RGB": "RGB",
+    "RGB24": "RGB",
+    "BGR": "BGR",
+    "BGR24": "BGR",
+    # Padding bytes convert like alpha
+    "RGBA": "RGBA",
+    "RGBX": "RGBA",
+    "BGRA": "BGRA",
+    "BGRX": "BGRA",
+    "I420": "I420",
+    "IYUV": "I420",
+    "YUV420": "I420",
+    "YUV420P": "I420",
+    "YV12": "YV12",
+    "NV12": "NV12",
+    "NV21": "NV21",
+}
+_COMPRESSED_FORMATS = ("JPEG", "JPG", "MJPEG", "MJPG", "PNG", "WEBP", "BMP")
+_CHANNELS = {"GRAY": 1, "RGB": 3, "BGR": 3, "RGBA": 4, "BGRA": 4}
+_YUV420_LAYOUTS = ("I420", "YV12", "NV12", "NV21")
+
+_TO_GRAY = {
+    "RGB": "COLOR_RGB2GRAY",
+    "BGR": "COLOR_BGR2GRAY",
+    "RGBA": "COLOR_RGBA2GRAY",
+    "BGRA": "COLOR_BGRA2GRAY",
+}
+_TO_BGR = {
+    "RGB": "COLOR_RGB2BGR",
+    "RGBA": "COLOR_RGBA2BGR",
+    "BGRA": "COLOR_BGRA2BGR",
+    "GRAY": "COLOR_GRAY2BGR",
+    "I420": "COLOR_YUV2BGR_I420",
+    "YV12": "COLOR_YUV2BGR_YV12",
+    "NV12": "COLOR_YUV2BGR_NV12",
+    "NV21": "COLOR_YUV2BGR_NV21",
+}
+
+
+def _pixel_layout(format: Optional[str], data_len: int, width: int, height: int) -> str:
+    """Map a transport format (or, failing that, the buffer size) to a layout."""
+    name = (format or "").upper().replace("-", "").replace("_", "")
+    if name in _COMPRESSED_FORMATS:
+        return "compressed"
+    if name in _RAW_LAYOUTS:
+        return _RAW_LAYOUTS[name]
+
+    # Unknown or missing format: infer from the buffer size (BGR as OpenCV assumes)
+    pixels = width * height
+    if data_len == pixels * 3:
+        return "BGR"
+    if data_len == pixels * 4:
+        return "BGRA"
+    if data_len == pixels * 3 // 2:
+        return "I420"
+    if data_len == pixels:
+        return "GRAY"
+    return "compressed"
+
+
+def frame_from_raw(
+    data, size: tuple[int, int], format: Optional[str], grayscale: bool
+):
+    """
+    Turn a transport image buffer into a detector-ready frame with minimal work.
+
+    Raw buffers are wrapped in place (no copy) and converted in a single pass
+    straight to what the detector consumes: for grayscale detectors, an RGB(A)
+    buffer goes directly to gray and an I420/NV12 buffer's Y plane is used as
+    the gray image with no conversion at all. Only compressed formats are
+    decoded, and then straight to grayscale when that is all that is needed.
+
+    Args:
+        data: Image bytes (raw pixels or a compressed image)
+        size: (width, height) of the image
+        format: Transport pixel format, e.g. "RGB", "RGBA", "I420" or "JPEG"
+            (None or unknown: inferred from the buffer size)
+        grayscale: Whether the detector wants a grayscale frame (cascades) or
+            BGR (DNN backends)
+
+    Returns:
+        Grayscale (H, W) or BGR (H, W, 3) image, or None if it cannot be read
+    """
+    import numpy as np
+
+    width, height = size
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    layout = _pixel_layout(format, buffer.size, width, height)
+
+    if layout == "compressed":
+        flags = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+        return cv2.imdecode(buffer, flags)
+
+    if layout in _YUV420_LAYOUTS:
+        if buffer.size < width * height * 3 // 2:
+            return None
+        if grayscale:
+            # The first width*height bytes are the luma plane: already grayscale
+            return buffer[: width * height].reshape(height, width)
+        yuv = buffer[: width * height * 3 // 2].reshape(height * 3 // 2, width)
+        return cv2.cvtColor(yuv, getattr(cv2, _TO_BGR[layout]))
+
+    channels = _CHANNELS[layout]
+    if buffer.size < width * height * channels:
+        return None
+    pixels = buffer[: width * height * channels]
+
+    if layout == "GRAY":
+        gray = pixels.reshape(height, width)
+        return gray if grayscale else cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+
+    image = pixels.reshape(height, width, channels)
+    if grayscale:
+        return cv2.cvtColor(image, getattr(cv2, _TO_GRAY[layout]))
+    if layout == "BGR":
+        return image
+    return cv2.cvtColor(image, getattr(cv2, _TO_BGR[layout]))
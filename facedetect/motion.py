@@ -0,0 +1,125 @@
+"""
+Cheap motion gating in front of face detection.
+
+An empty, static room does not need a cascade scan every interval. MotionGate
+compares a tiny grayscale thumbnail of each frame against a slowly-updating
+background and lets the caller skip detection when nothing has changed and
+the last detection found nobody.
+"""
+
+from .cascades import cv2
+from .image import to_gray
+
+
+class MotionGate:
+    """
+    Frame-differencing gate on a tiny thumbnail with a running-average background.
+    """
+
+    def __init__(
+        self,
+        thumbnail_size: tuple[int, int] = (32, 24),
+        pixel_threshold: int = 12,
+        motion_fraction: float = 0.02,
+        learning_rate: float = 0.05,
+        max_skips: int = 30,
+    ):
+        """
+        Initialize the motion gate.
+
+        Args:
+            thumbnail_size: (width, height) of the comparison thumbnail
+            pixel_threshold: Gray-level difference that counts a pixel as changed
+            motion_fraction: Fraction of changed pixels that counts as motion
+            learning_rate: How quickly the background absorbs lighting changes
+            max_skips: Force a detection after this many consecutive skips
+        """
+        self.thumbnail_size = thumbnail_size
+        self.pixel_threshold = pixel_threshold
+        self.motion_fraction = motion_fraction
+        self.learning_rate = learning_rate
+        self.max_skips = max_skips
+
+        self._background = None
+        self._motion = False
+        self._consecutive_skips = 0
+        self._checked = 0
+        self._skipped = 0
+
+    def reset(self):
+        """Forget the background so the next frame is always detected."""
+        self._background = None
+        self._consecutive_skips = 0
+
+    @property
+    def motion(self) -> bool:
+        """Whether the most recently checked frame showed motion."""
+        return self._motion
+
+    def has_motion(self, frame) -> bool:
+        """
+        Compare the frame against the background and update the background.
+
+        Args:
+            frame: BGR or grayscale image
+
+        Returns:
+            True if enough of the thumbnail changed to count as motion
+        """
+        # Shrink first so the color conversion only touches a few hundred pixels
+        thumbnail = to_gray(
+            cv2.resize(frame, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        )
+
+        if self._background is None:
+            self._background = thumbnail.astype("float32")
+            self._motion = True
+            return True
+
+        diff = cv2.absdiff(thumbnail, cv2.convertScaleAbs(self._background))
+        _, changed = cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)
+        cv2.accumulateWeighted(thumbnail, self._background, self.learning_rate)
+
+        self._motion = cv2.countNonZero(changed) >= self.motion_fraction * changed.size
+        return self._motion
+
+    def should_detect(self, frame, last_face_count: int) -> bool:
+        """
+        Decide whether the frame needs a full detection.
+
+        Detection is skipped only when the scene is static and the previous
+        detection found no faces, and never for more than max_skips frames
+        in a row.
+
+        Args:
+            frame: BGR or grayscale image
+            last_face_count: Face count from the previous detection
+
+        Returns:
+            True if the caller should run detection on this frame
+        """
+        self._checked += 1
+        moving = self.has_motion(frame)
+
+        forced = self._consecutive_skips >= self.max_skips
+        if moving or last_face_count > 0 or forced:
+            self._consecutive_skips = 0
+            return True
+
+        self._consecutive_skips += 1
+        self._skipped += 1
+        return False
+
+    def stats(self) -> dict:
+        """
+        Get gate statistics.
+
+        Returns:
+            Dictionary with frames checked, frames skipped and the skip rate
+        """
+        skip_rate = self._skipped / self._checked if self._checked else 0.0
+        return {
+            "checked": self._checked,
+            "skipped": self._skipped,
+            "skip_rate": round(skip_rate, 3),
+        }
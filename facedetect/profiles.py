@@ -0,0 +1,36 @@
+"""
+Named detectMultiScale parameter profiles for the cascade backends.
+"""
+
+from typing import Optional
+
+PROFILES = {
+    # The parameters every consumer used before this package existed
+    "default": {"scale_factor": 1.1, "min_neighbors": 5, "min_size": (30, 30)},
+    # Tuned for a kiosk webcam on a Pi: a coarser pyramid step roughly halves
+    # the number of scales scanned, and nobody using the kiosk is far enough
+    # away to show up smaller than 48px at 640x480
+    "pi": {"scale_factor": 1.2, "min_neighbors": 4, "min_size": (48, 48)},
+    # Slower but finds smaller and partially turned faces
+    "accurate": {"scale_factor": 1.05, "min_neighbors": 6, "min_size": (24, 24)},
+}
+
+DEFAULT_PROFILE = "default"
+
+
+def get_profile(name: Optional[str] = None) -> dict:
+    """
+    Get cascade parameters for a named profile.
+
+    Args:
+        name: Profile name (default: "default")
+
+    Returns:
+        Dictionary of HaarBackend keyword arguments
+    """
+    name = name or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(
+            f"Unknown detection profile {name!r} (choose from {', '.join(PROFILES)})"
+        )
+    return dict(PROFILES[name])
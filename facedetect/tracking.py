@@ -0,0 +1,220 @@
+"""
+Region-of-interest tracking on top of a detection backend.
+
+Scanning a full-resolution frame at every pyramid level is the dominant
+detection cost on large webcams. Once a face has been found, FaceTracker only
+scans an expanded region around each known face, resized so the face is a
+modest, fixed number of pixels wide. Newcomers are looked for on a heavily
+downscaled copy of the frame every Nth frame, and whenever a region scan loses
+a tracked face; only when that cheap scan finds something unexplained is the
+whole frame scanned at full resolution.
+"""
+
+import time
+
+from .backends import DetectionBackend, Face
+from .cascades import cv2
+
+
+class FaceTracker:
+    """
+    Wraps a DetectionBackend with ROI tracking and downscaled newcomer scans.
+
+    Region scans report the tracked faces they find again, in full-frame pixel
+    coordinates; they are never downscaled below twice the backend's smallest
+    detectable face. Coarse scans of a downscaled frame look for faces outside
+    the tracked ones, and a full-resolution scan runs only when they find one
+    that neither a tracked face nor the previous full scan accounts for; a
+    tracked face a region scan loses but a coarse scan still sees is kept. Full
+    scans return exactly the wrapped backend's faces, but since a face must
+    first show up in a coarse scan, newcomers smaller than min_face_width (the
+    backend's minimum scaled up by the coarse downscale) can be missed, and a
+    newcomer is reported up to coarse_scan_every frames late.
+    """
+
+    def __init__(
+        self,
+        backend: DetectionBackend,
+        roi_margin: float = 0.75,
+        roi_face_size: int = 80,
+        coarse_scan_every: int = 10,
+        coarse_scan_width: int = 480,
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            backend: Detection backend used for every scan
+            roi_margin: How far to expand each face box, as a fraction of its size
+            roi_face_size: Width in pixels a tracked face is resized to in its ROI
+                (raised to twice the backend's smallest detectable face)
+            coarse_scan_every: Look for newcomers every N frames while tracking
+            coarse_scan_width: Width in pixels of the downscaled newcomer scan
+        """
+        self.backend = backend
+        self.roi_margin = roi_margin
+        self.roi_face_size = max(roi_face_size, 2 * backend.min_face_width)
+        self.coarse_scan_every = max(1, coarse_scan_every)
+        self.coarse_scan_width = coarse_scan_width
+
+        self._tracked: list[Face] = []
+        # Coarse hits the last full scan did not confirm
+        self._rejected: list[Face] = []
+        self._coarse_scale = 1.0
+        self._frame_index = 0
+        self._roi_scans = 0
+        self._coarse_scans = 0
+        self._full_scans = 0
+        self._last_ms = 0.0
+
+    def reset(self):
+        """Forget tracked and rejected faces."""
+        self._tracked = []
+        self._rejected = []
+        self._frame_index = 0
+
+    @property
+    def min_face_width(self) -> int:
+        """Smallest newcomer, in pixels of the last frame, coarse scans can find."""
+        return int(self.backend.min_face_width / self._coarse_scale)
+
+    def _scan_scaled(
+        self, image, scale: float, x0: int = 0, y0: int = 0
+    ) -> list[Face]:
+        """Scan image resized by scale and map results back to frame coordinates."""
+        if scale < 1.0:
+            image = cv2.resize(
+                image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+            )
+        else:
+            scale = 1.0
+
+        return [
+            Face(
+                x0 + int(face.x / scale),
+                y0 + int(face.y / scale),
+                int(face.w / scale),
+                int(face.h / scale),
+                face.score,
+            )
+            for face in self.backend.detect(image)
+        ]
+
+    def _coarse_scan(self, frame) -> list[Face]:
+        self._coarse_scans += 1
+        self._coarse_scale = min(1.0, self.coarse_scan_width / frame.shape[1])
+        return self._scan_scaled(frame, self._coarse_scale)
+
+    def _full_scan(self, frame) -> list[Face]:
+        self._full_scans += 1
+        return self.backend.detect(frame)
+
+    def _regions(self, width: int, height: int) -> list[list[int]]:
+        """
+        Expanded boxes around tracked faces, merged where they overlap.
+
+        Returns:
+            List of [x1, y1, x2, y2, smallest face width in the region]
+        """
+        regions = []
+        for face in self._tracked:
+            margin_x = int(face.w * self.roi_margin)
+            margin_y = int(face.h * self.roi_margin)
+            regions.append(
+                [
+                    max(0, face.x - margin_x),
+                    max(0, face.y - margin_y),
+                    min(width, face.x + face.w + margin_x),
+                    min(height, face.y + face.h + margin_y),
+                    face.w,
+                ]
+            )
+
+        merged = []
+        for region in sorted(regions):
+            last = merged[-1] if merged else None
+            overlaps = (
+                last is not None
+                and region[0] <= last[2]
+                and region[1] <= last[3]
+                and region[3] >= last[1]
+            )
+            if overlaps:
+                last[1] = min(last[1], region[1])
+                last[2] = max(last[2], region[2])
+                last[3] = max(last[3], region[3])
+                last[4] = min(last[4], region[4])
+            else:
+                merged.append(region)
+
+        return merged
+
+    def _roi_scan(self, frame) -> list[Face]:
+        self._roi_scans += 1
+        height, width = frame.shape[:2]
+
+        faces = []
+        for x1, y1, x2, y2, face_width in self._regions(width, height):
+            scale = min(1.0, self.roi_face_size / max(1, face_width))
+            for face in self._scan_scaled(frame[y1:y2, x1:x2], scale, x1, y1):
+                # Regions can still overlap after merging; count each face once
+                if not self._contains_center(faces, face):
+                    faces.append(face)
+        return faces
+
+    @staticmethod
+    def _contains_center(faces: list[Face], face: Face) -> bool:
+        cx, cy = face.x + face.w / 2, face.y + face.h / 2
+        return any(f.x <= cx <= f.x + f.w and f.y <= cy <= f.y + f.h for f in faces)
+
+    def detect(self, frame) -> list[Face]:
+        """
+        Detect faces, scanning only around known faces where possible.
+
+        Args:
+            frame: BGR or grayscale image
+
+        Returns:
+            List of detected faces in frame pixel coordinates
+        """
+        start = time.perf_counter()
+
+        faces = self._roi_scan(frame) if self._tracked else []
+        lost = len(faces) < len(self._tracked)
+
+        if lost or not faces or self._frame_index % self.coarse_scan_every == 0:
+            # Look for newcomers (or a face that moved) on a cheap downscaled copy
+            candidates = self._coarse_scan(frame)
+            # A tracked face the region scan lost but the coarse scan still sees stays
+            faces += [
+                face
+                for face in self._tracked
+                if not self._contains_center(faces, face)
+                and any(self._contains_center([face], c) for c in candidates)
+            ]
+            known = faces + self._rejected
+            if any(not self._contains_center(known, c) for c in candidates):
+                faces = self._full_scan(frame)
+                self._rejected = [
+                    c for c in candidates if not self._contains_center(faces, c)
+                ]
+
+        self._tracked = faces
+        self._frame_index += 1
+        self._last_ms = (time.perf_counter() - start) * 1000
+        return faces
+
+    def stats(self) -> dict:
+        """
+        Get tracking statistics.
+
+        Returns:
+            Dictionary with tracked face count, scan counts and last frame ms
+        """
+        return {
+            "tracked": len(self._tracked),
+            "roi_scans": self._roi_scans,
+            "coarse_scans": self._coarse_scans,
+            "full_scans": self._full_scans,
+            "last_ms": round(self._last_ms, 2),
+        }
@@ -0,0 +1,179 @@
+"""
+Camera detection loop, runnable on a thread or as a separate worker process.
+
+run_camera_detection() owns a camera: it drains it with grab() (no decode)
+so the driver queue never goes stale, decodes only the frames it checks, and
+reports each DetectionResult through a callback.
+
+Run as ``python -m facedetect`` (see __main__.py) it becomes an isolated
+detection process that writes one JSON line per result (and per log message)
+to stdout and stops when stdin closes or on SIGTERM. The bot uses that mode to keep
+vision CPU and the GIL away from its real-time audio path; the child only
+imports this package, not the bot.
+"""
+
+import argparse
+import json
+import signal
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .backends import DetectionBackend, Face, create_backend
+from .cascades import CV2_AVAILABLE, cv2
+
+
+@dataclass
+class DetectionResult:
+    """Outcome of one camera detection cycle."""
+
+    face_count: int
+    timestamp: float
+    faces: list[Face] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "type": "result",
+                "face_count": self.face_count,
+                "timestamp": self.timestamp,
+                "faces": [
+                    [face.x, face.y, face.w, face.h, round(face.score, 3)]
+                    for face in self.faces
+                ],
+                "error": self.error,
+            }
+        )
+
+    @classmethod
+    def from_dict(cls, message: dict) -> "DetectionResult":
+        return cls(
+            face_count=message["face_count"],
+            timestamp=message["timestamp"],
+            faces=[Face(*box) for box in message.get("faces", [])],
+            error=message.get("error"),
+        )
+
+
+def _no_log(level: str, message: str):
+    pass
+
+
+def run_camera_detection(
+    camera_index: int,
+    check_interval: float,
+    backend: DetectionBackend,
+    on_result: Callable[[DetectionResult], None],
+    stop_event: threading.Event,
+    log: Callable[[str, str], None] = _no_log,
+):
+    """
+    Capture from a camera and detect faces until stop_event is set.
+
+    Args:
+        camera_index: Camera device index
+        check_interval: Seconds between face detection checks
+        backend: Detection backend to run on the checked frames
+        on_result: Called with each DetectionResult
+        stop_event: Set to stop the loop
+        log: Called with (level, message), e.g. loguru's logger.log
+
+    Raises:
+        RuntimeError: If the camera cannot be opened
+    """
+    # Opening a camera can take a second or more
+    capture = cv2.VideoCapture(camera_index)
+    if not capture.isOpened():
+        raise RuntimeError(f"Failed to open camera {camera_index}")
+
+    last_check_time = 0.0
+    try:
+        while not stop_event.is_set():
+            # grab() blocks until the next frame, which paces this loop
+            if not capture.grab():
+                log("WARNING", "Failed to capture frame from camera")
+                stop_event.wait(0.1)
+                continue
+
+            current_time = time.time()
+            if current_time - last_check_time < check_interval:
+                continue
+            last_check_time = current_time
+
+            ret, frame = capture.retrieve()
+            if not ret or frame is None:
+                log("WARNING", "Failed to decode frame from camera")
+                continue
+
+            try:
+                faces = backend.detect(frame)
+                result = DetectionResult(len(faces), current_time, faces)
+            except Exception as e:
+                log("ERROR", f"Error detecting faces: {e}")
+                result = DetectionResult(0, current_time, error=str(e))
+
+            on_result(result)
+    finally:
+        capture.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Camera face detection worker (JSON lines on stdout)"
+    )
+    parser.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--backend", default="haar")
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--profile", default=None)
+    args = parser.parse_args()
+
+    output_lock = threading.Lock()
+
+    def send(line: str):
+        with output_lock:
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+
+    def log(level: str, message: str):
+        send(json.dumps({"type": "log", "level": level, "message": message}))
+
+    if not CV2_AVAILABLE:
+        log("ERROR", "OpenCV (cv2) is not available")
+        return 1
+
+    try:
+        backend = create_backend(args.backend, args.model_path, args.profile)
+    except (RuntimeError, ValueError) as e:
+        log("ERROR", f"Failed to load face detection backend: {e}")
+        return 1
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+
+    # The parent closes stdin to stop us (and it closes anyway if the parent dies)
+    def watch_stdin():
+        sys.stdin.read()
+        stop_event.set()
+
+    threading.Thread(target=watch_stdin, name="stdin-watch", daemon=True).start()
+
+    try:
+        run_camera_detection(
+            args.camera,
+            args.interval,
+            backend,
+            lambda result: send(result.to_json()),
+            stop_event,
+            log,
+        )
+    except RuntimeError as e:
+        log("ERROR", str(e))
+        return 1
+    except BrokenPipeError:
+        # Parent went away
+        pass
+    return 0
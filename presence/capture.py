@@ -0,0 +1,276 @@
+"""
+Camera capture module for presence detection service.
+
+This module drains a camera on a dedicated thread, so the detector always
+works on the freshest frame instead of whatever has been sitting in the driver
+queue. Only the frames the detector asks for are decoded, into a small ring of
+reused frame buffers. Recorded video files and
+directories of still frames can be opened through the same interface, for
+offline replay.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+
+class FrameGrabber:
+    """
+    Continuously drains an opened cv2.VideoCapture on its own thread.
+
+    The thread only ``grab()``s frames, which dequeues them without decoding;
+    when the reader asks for a frame, the next grabbed one is decoded with
+    ``retrieve(image=...)`` into a preallocated ring of numpy buffers. So the
+    camera is drained at its own frame rate but decoded only at the detection
+    rate, and steady-state capture does not allocate. All capture calls stay
+    on the grab thread. The slot most recently handed to the reader is never
+    overwritten until the reader asks for the next frame.
+    """
+
+    def __init__(self, capture, slots: int = 3):
+        """
+        Initialize the frame grabber.
+
+        Args:
+            capture: An opened cv2.VideoCapture
+            slots: Number of ring buffer slots (minimum 3: writing, latest, held)
+        """
+        self._cap = capture
+        self._num_slots = max(3, slots)
+        self._slots: list = []
+
+        self._lock = threading.Lock()
+        self._frame_ready = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # Ring buffer bookkeeping (guarded by _lock)
+        self._latest_index: Optional[int] = None
+        self._latest_timestamp: Optional[float] = None
+        self._held_index: Optional[int] = None
+        self._seq = 0
+        self._grab_seq = 0
+        self._requested = False
+        self._error: Optional[str] = None
+
+    def start(self):
+        """Allocate the ring buffer from a first frame and start the grab thread."""
+        if self._running:
+            return
+
+        ret, frame = self._cap.read()
+        if not ret or frame is None:
+            raise RuntimeError("Failed to capture initial frame")
+
+        self._slots = [frame] + [frame.copy() for _ in range(self._num_slots - 1)]
+        with self._lock:
+            self._latest_index = 0
+            self._latest_timestamp = time.time()
+            self._held_index = None
+            self._seq = 1
+            self._grab_seq = 1
+            self._requested = False
+            self._error = None
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._grab_loop, name="presence-frame-grabber", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the grab thread. The caller still owns and releases the capture."""
+        self._running = False
+        with self._lock:
+            self._frame_ready.notify_all()
+
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def error(self) -> Optional[str]:
+        """Last capture error, or None if the most recent read succeeded."""
+        return self._error
+
+    def _next_write_index(self) -> int:
+        """Pick a slot that is neither the latest frame nor held by the reader."""
+        for offset in range(1, self._num_slots + 1):
+            index = ((self._latest_index or 0) + offset) % self._num_slots
+            if index != self._latest_index and index != self._held_index:
+                return index
+        raise RuntimeError("No free frame buffer slot")
+
+    def _grab_loop(self):
+        """Drain the camera as fast as it delivers frames, decoding on request."""
+        while self._running:
+            ret = self._cap.grab()
+            timestamp = time.time()
+
+            if not ret:
+                with self._lock:
+                    self._error = "Failed to capture frame"
+                time.sleep(0.05)
+                continue
+
+            with self._lock:
+                self._grab_seq += 1
+                self._error = None
+                if not self._requested:
+                    continue
+                index = self._next_write_index()
+
+            ret, frame = self._cap.retrieve(image=self._slots[index])
+            if not ret or frame is None:
+                with self._lock:
+                    self._error = "Failed to decode frame"
+                continue
+
+            # The driver may hand back a new array if the frame geometry changed
+            if frame is not self._slots[index]:
+                self._slots[index] = frame
+
+            with self._lock:
+                self._latest_index = index
+                self._latest_timestamp = timestamp
+                self._seq = self._grab_seq
+                self._requested = False
+                self._frame_ready.notify_all()
+
+    def read_latest(self, after_seq: int = 0, timeout: float = 1.0):
+        """
+        Get the freshest captured frame.
+
+        Decodes the next frame the camera delivers (or returns the last decoded
+        one if it is already newer than after_seq). The returned buffer stays
+        valid until the next call to read_latest().
+
+        Args:
+            after_seq: Wait for a frame newer than this sequence number
+            timeout: Maximum seconds to wait for a newer frame
+
+        Returns:
+            Tuple of (frame, capture_timestamp, seq), or None if no new frame
+            arrived within the timeout
+        """
+        with self._lock:
+            if self._seq <= after_seq:
+                self._requested = True
+                self._frame_ready.wait_for(
+                    lambda: self._seq > after_seq or not self._running, timeout
+                )
+                self._requested = False
+            if self._latest_index is None or self._seq <= after_seq:
+                return None
+
+            self._held_index = self._latest_index
+            return (
+                self._slots[self._held_index],
+                self._latest_timestamp,
+                self._seq,
+            )
+
+
+IMAGE_EXTENSIONS = (".bmp", ".jpeg", ".jpg", ".png", ".tif", ".tiff", ".webp")
+
+
+class ImageDirectorySource:
+    """
+    A directory of still frames that reads like a cv2.VideoCapture.
+
+    Frames are returned in filename order. Only ``isOpened()``, ``read()``,
+    ``grab()``, ``retrieve()``, ``get()`` (position, FPS and frame count) and
+    ``release()`` are supported, which is all FrameGrabber and the replay tool
+    use.
+    """
+
+    def __init__(self, path: Union[str, Path], fps: float = 1.0):
+        """
+        Initialize the source.
+
+        Args:
+            path: Directory containing image files
+            fps: Frame rate the stills are treated as having been captured at
+        """
+        import cv2
+
+        self._cv2 = cv2
+        self.fps = fps
+        self._files = sorted(
+            entry
+            for entry in Path(path).iterdir()
+            if entry.suffix.lower() in IMAGE_EXTENSIONS
+        )
+        self._index = 0
+
+    def isOpened(self) -> bool:
+        return bool(self._files)
+
+    def read(self, image=None):
+        """Read the next frame, copying into ``image`` when the shapes match."""
+        while self._index < len(self._files):
+            frame = self._cv2.imread(str(self._files[self._index]))
+            self._index += 1
+            if frame is None:
+                continue
+            if image is not None and image.shape == frame.shape:
+                image[...] = frame
+                return True, image
+            return True, frame
+        return False, None
+
+    def grab(self) -> bool:
+        """Advance to the next frame without decoding it."""
+        if self._index >= len(self._files):
+            return False
+        self._index += 1
+        return True
+
+    def retrieve(self, image=None):
+        """Decode the frame last grabbed, copying into ``image`` when the shapes match."""
+        if self._index == 0:
+            return False, None
+        frame = self._cv2.imread(str(self._files[self._index - 1]))
+        if frame is None:
+            return False, None
+        if image is not None and image.shape == frame.shape:
+            image[...] = frame
+            return True, image
+        return True, frame
+
+    def get(self, prop: int) -> float:
+        cv2 = self._cv2
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._index)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return max(0, self._index - 1) * 1000.0 / self.fps
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self._files))
+        return 0.0
+
+    def release(self):
+        self._files = []
+
+
+def open_capture(source: Union[int, str]):
+    """
+    Open a camera, a recorded video file or a directory of frames.
+
+    Args:
+        source: Camera index (int or digit string), video path or directory path
+
+    Returns:
+        An object with the cv2.VideoCapture read interface
+    """
+    import cv2
+
+    if isinstance(source, int):
+        return cv2.VideoCapture(source)
+    if source.isdigit():
+        return cv2.VideoCapture(int(source))
+    if Path(source).is_dir():
+        return ImageDirectorySource(source)
+    return cv2.VideoCapture(source)
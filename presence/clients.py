@@ -0,0 +1,125 @@
+"""
+Per-client WebSocket senders for the presence server.
+
+Each connected client gets its own send task and a small bounded queue, so a
+slow browser tab only ever delays its own updates. Updates are deltas, so
+when a client falls behind its backlog is thrown away and replaced by a
+single full-status resync rather than silently dropping a change. Streams
+whose every message is a full state (face boxes) are sent latest-wins
+instead: a newer message simply replaces the pending one.
+"""
+
+import asyncio
+from typing import Callable, Optional, Union
+
+from fastapi import WebSocket
+from loguru import logger
+
+from metrics import RESYNCS, SEND_FAILURES
+
+
+class ClientSender:
+    """
+    Sends pre-serialised messages to one WebSocket client from its own task.
+    """
+
+    # Queued in place of a dropped backlog; sent as a fresh full status
+    _RESYNC = object()
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        snapshot: Callable[[str], Union[str, bytes]],
+        encoding: str = "json",
+        max_pending: int = 4,
+        latest_wins: bool = False,
+    ):
+        """
+        Initialize the sender.
+
+        Args:
+            websocket: An accepted WebSocket connection
+            snapshot: Returns the current full status in a given encoding, for resyncs
+            encoding: Wire encoding negotiated with this client (see protocol.py)
+            max_pending: Messages held for this client before it is resynced
+            latest_wins: Replace the backlog with the newest message instead of
+                a resync, for streams where each message is a full state
+        """
+        self.websocket = websocket
+        self.encoding = encoding
+        self._snapshot = snapshot
+        self.latest_wins = latest_wins
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_pending))
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+        self.closed = False
+
+    def start(self):
+        """Start the send task."""
+        if not self._task:
+            self._task = asyncio.create_task(self._send_loop())
+
+    async def stop(self):
+        """Stop the send task."""
+        self.closed = True
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def offer(self, message: Union[str, bytes], if_idle: bool = False):
+        """
+        Queue a message without waiting.
+
+        If the queue is full, the backlog is replaced by one full-status resync,
+        or by this message for latest-wins senders.
+
+        Args:
+            message: Serialised message in this client's encoding
+            if_idle: Only queue the message if nothing else is pending (heartbeats)
+        """
+        if self.closed:
+            return
+
+        if if_idle and not self._queue.empty():
+            return
+
+        if self._queue.full():
+            while not self._queue.empty():
+                self._queue.get_nowait()
+                self.dropped += 1
+            if self.latest_wins:
+                self._queue.put_nowait(message)
+                return
+            self._queue.put_nowait(self._RESYNC)
+            RESYNCS.inc()
+            return
+
+        self._queue.put_nowait(message)
+
+    async def _send_loop(self):
+        """Drain the queue to the socket until cancelled or the send fails."""
+        while True:
+            message = await self._queue.get()
+            if message is self._RESYNC:
+                message = self._snapshot(self.encoding)
+            try:
+                if isinstance(message, bytes):
+                    await self.websocket.send_bytes(message)
+                else:
+                    await self.websocket.send_text(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to send to client: {e}")
+                SEND_FAILURES.inc()
+                self.closed = True
+                # Unblock the endpoint's receive loop so it cleans up the client
+                try:
+                    await self.websocket.close()
+                except Exception:
+                    pass
+                return
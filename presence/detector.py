@@ -1,65 +1,113 @@
 """
 Face detection module for presence detection service.
 
-This module provides async-friendly face detection using OpenCV's Haar Cascade classifier.
+This module provides async-friendly face detection using a pluggable OpenCV
+backend (Haar or LBP cascade, or a YuNet/SSD DNN model).
 """
 
 import asyncio
 import time
-import os
-from pathlib import Path
 from datetime import datetime, timezone
-from typing import Optional
-
-# Try to import cv2, but gracefully handle if it's not available
-try:
+from typing import Optional, Union
+
+from capture import FrameGrabber, open_capture
+from events import StatusChannel
+from metrics import (
+    CAPTURE_AGE,
+    CAPTURE_FAILURES,
+    DETECTION_INTERVAL,
+    DETECTION_SECONDS,
+    DETECTIONS,
+    DETECTIONS_SKIPPED,
+    FRAMES_SUPERSEDED,
+)
+from scheduler import AdaptiveScheduler
+
+from facedetect import (
+    CV2_AVAILABLE,
+    DetectionBackend,
+    Face,
+    FaceTracker,
+    MotionGate,
+    create_backend,
+)
+
+if CV2_AVAILABLE:
     import cv2
 
-    CV2_AVAILABLE = True
-except ImportError:
-    CV2_AVAILABLE = False
-    cv2 = None
+# Status fields whose change is a real state change (everything else in
+# get_status() is a timestamp or a statistic)
+STATE_FIELDS = ("available", "present", "face_count", "error")
 
 
-def find_cascade_file(
-    cascade_name: str = "haarcascade_frontalface_default.xml",
-) -> Optional[str]:
+class PresenceDebouncer:
+    """
+    Turns per-detection face counts into a debounced present/absent state.
     """
-    Find the Haar Cascade XML file in common locations.
 
-    Args:
-        cascade_name: Name of the cascade file to find
+    def __init__(self, present_delay: float = 5.0, absent_delay: float = 5.0):
+        """
+        Initialize the debouncer.
 
-    Returns:
-        Path to the cascade file, or None if not found
-    """
-    if not CV2_AVAILABLE:
-        return None
-
-    # List of common locations to search
-    search_paths = [
-        # OpenCV's cv2.data.haarcascades path (most common)
-        cv2.data.haarcascades + cascade_name if hasattr(cv2, "data") else None,
-        # Common system paths on Linux
-        f"/usr/share/opencv4/haarcascades/{cascade_name}",
-        f"/usr/local/share/opencv4/haarcascades/{cascade_name}",
-        f"/usr/share/opencv/haarcascades/{cascade_name}",
-        f"/usr/local/share/opencv/haarcascades/{cascade_name}",
-        # Raspberry Pi specific paths
-        f"/usr/share/opencv/data/haarcascades/{cascade_name}",
-        f"/usr/local/share/OpenCV/haarcascades/{cascade_name}",
-        # Conda/virtual environment paths
-        os.path.join(os.path.dirname(cv2.__file__), "data", cascade_name)
-        if cv2
-        else None,
-    ]
-
-    # Filter out None values and check each path
-    for path in search_paths:
-        if path and os.path.exists(path):
-            return path
-
-    return None
+        Args:
+            present_delay: Seconds of continuous face detection before marking present
+            absent_delay: Seconds of no faces before marking absent
+        """
+        self.present_delay = present_delay
+        self.absent_delay = absent_delay
+        self.present = False
+
+        self._faces_detected_since: Optional[float] = None
+        self._no_faces_since: Optional[float] = None
+
+    @property
+    def transitioning(self) -> bool:
+        """True while a present or absent timer is running but has not fired."""
+        return (self._faces_detected_since is not None and not self.present) or (
+            self._no_faces_since is not None and self.present
+        )
+
+    def update(self, face_count: int, current_time: float) -> bool:
+        """
+        Feed one detection result.
+
+        Args:
+            face_count: Faces found in the frame
+            current_time: When the frame was captured (seconds)
+
+        Returns:
+            The debounced presence state
+        """
+        if face_count > 0:
+            # Faces detected
+            if self._faces_detected_since is None:
+                # Start tracking continuous detection
+                self._faces_detected_since = current_time
+
+            # Reset the "no faces" timer
+            self._no_faces_since = None
+
+            # Check if faces have been detected long enough
+            if not self.present:
+                detection_duration = current_time - self._faces_detected_since
+                if detection_duration >= self.present_delay:
+                    self.present = True
+        else:
+            # No faces detected
+            if self._no_faces_since is None:
+                # Start tracking time with no faces
+                self._no_faces_since = current_time
+
+            # Reset the "faces detected" timer
+            self._faces_detected_since = None
+
+            # Check if enough time has passed without faces
+            if self.present:
+                no_face_duration = current_time - self._no_faces_since
+                if no_face_duration >= self.absent_delay:
+                    self.present = False
+
+        return self.present
 
 
 class FaceDetector:
@@ -69,27 +117,67 @@ class FaceDetector:
 
     def __init__(
         self,
-        camera_index: int = 0,
+        camera_index: Union[int, str] = 0,
         interval: float = 1.0,
         present_delay: float = 5.0,
         absent_delay: float = 5.0,
+        backend: str = "haar",
+        model_path: Optional[str] = None,
+        profile: Optional[str] = None,
+        tracking: bool = False,
+        motion_gate: bool = False,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        cpu_budget: float = 0.5,
     ):
         """
         Initialize the face detector.
 
         Args:
-            camera_index: Camera device index (default: 0)
+            camera_index: Camera device index, or a video file or frame directory
+                path (default: 0)
             interval: Interval between detections in seconds (default: 1.0)
             present_delay: Seconds of continuous face detection before marking present (default: 5.0)
             absent_delay: Seconds of no faces before marking absent (default: 10.0)
+            backend: Detection backend name: haar, lbp, yunet or ssd (default: haar)
+            model_path: Local model file for the backend (default: backend search)
+            profile: Cascade parameter profile, e.g. "pi" (default: "default")
+            tracking: Only scan around known faces plus a downscaled frame
+                every few frames, instead of the whole frame (default: False)
+            motion_gate: Skip detection while the scene is static and empty
+                (default: False)
+            min_interval: Shortest adaptive interval; setting this or max_interval
+                enables the adaptive scheduler (default: None, fixed interval)
+            max_interval: Longest adaptive interval during sustained absence
+                (default: None, fixed interval)
+            cpu_budget: Maximum fraction of a core adaptive detection may use
+                (default: 0.5)
         """
         self.camera_index = camera_index
         self.interval = interval
         self.present_delay = present_delay
         self.absent_delay = absent_delay
+        self.backend_name = backend
+        self.model_path = model_path
+        self.profile = profile
+        self.tracking = tracking
+        self.motion_gate = motion_gate
+
+        self._scheduler: Optional[AdaptiveScheduler] = None
+        if min_interval is not None or max_interval is not None:
+            self._scheduler = AdaptiveScheduler(
+                base_interval=interval,
+                min_interval=min_interval if min_interval is not None else interval,
+                max_interval=max_interval if max_interval is not None else interval,
+                cpu_budget=cpu_budget,
+            )
 
         self._cap = None
-        self._face_cascade = None
+        self._grabber: Optional[FrameGrabber] = None
+        self._last_seq = 0
+        self._backend: Optional[DetectionBackend] = None
+        self._tracker: Optional[FaceTracker] = None
+        self._motion_gate: Optional[MotionGate] = None
         self._running = False
         self._task: Optional[asyncio.Task] = None
         self._available = CV2_AVAILABLE
@@ -98,11 +186,19 @@ class FaceDetector:
         self._present = False
         self._face_count = 0
         self._last_update = None
+        self._last_update_monotonic: Optional[float] = None
         self._error = None
 
+        # Status updates are pushed to subscribers (e.g. the WebSocket broadcaster)
+        self.updates = StatusChannel()
+        self._last_published_state: Optional[dict] = None
+
+        # Per-detection face boxes for the opt-in high-rate stream
+        self.face_updates = StatusChannel()
+        self._frame_size: Optional[tuple[int, int]] = None
+
         # Presence tracking for debouncing
-        self._faces_detected_since: Optional[float] = None
-        self._no_faces_since: Optional[float] = None
+        self._debouncer = PresenceDebouncer(present_delay, absent_delay)
 
     def _detect_faces(self, frame):
         """
@@ -112,37 +208,106 @@ class FaceDetector:
             frame: Image frame from webcam
 
         Returns:
-            List of face rectangles (x, y, w, h)
+            List of detected faces
         """
-        # Convert to grayscale for face detection
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self._tracker:
+            return self._tracker.detect(frame)
+        return self._backend.detect(frame)
 
-        # Detect faces
-        faces = self._face_cascade.detectMultiScale(
-            gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
-        )
+    def _capture_and_detect(
+        self,
+    ) -> tuple[bool, list[Face], Optional[str], float, float]:
+        """
+        Take the freshest frame from the grab thread and detect faces.
 
-        return faces
+        Returns:
+            Tuple of (success, faces, error_message, capture_timestamp,
+            detect_seconds), where detect_seconds covers only the detection
+            pipeline, not waiting for the frame
+        """
+        if not self._grabber or not self._backend:
+            return False, [], "Detector not initialized", time.time(), 0.0
+
+        latest = self._grabber.read_latest(after_seq=self._last_seq)
+        if latest is None:
+            CAPTURE_FAILURES.inc()
+            error = self._grabber.error or "Failed to capture frame"
+            return False, [], error, time.time(), 0.0
+
+        frame, captured_at, seq = latest
+        if self._last_seq:
+            FRAMES_SUPERSEDED.inc(max(0, seq - self._last_seq - 1))
+        self._last_seq = seq
+
+        start = time.time()
+        CAPTURE_AGE.observe(max(0.0, start - captured_at))
+        scanned = True
+        try:
+            faces, scanned = self.detect_frame(frame)
+            success, error = True, None
+        except Exception as e:
+            faces, success, error = [], False, str(e)
+        detect_seconds = time.time() - start
 
-    def _capture_and_detect(self) -> tuple[bool, int, Optional[str]]:
+        # Frames the motion gate skipped are counted in DETECTIONS_SKIPPED
+        if scanned:
+            DETECTION_SECONDS.observe(detect_seconds)
+            DETECTIONS.inc()
+        return success, faces, error, captured_at, detect_seconds
+
+    def detect_frame(self, frame) -> tuple[list[Face], bool]:
         """
-        Capture a frame and detect faces.
+        Run the detection pipeline (motion gate, then tracker or backend) on a frame.
+
+        Args:
+            frame: BGR image
 
         Returns:
-            Tuple of (success, face_count, error_message)
+            Tuple of (detected faces, whether the tracker or backend scanned the
+            frame); faces are empty if the motion gate skipped the frame
         """
-        if not self._cap or not self._face_cascade:
-            return False, 0, "Detector not initialized"
+        self._frame_size = (frame.shape[1], frame.shape[0])
 
-        ret, frame = self._cap.read()
-        if not ret:
-            return False, 0, "Failed to capture frame"
+        if self._motion_gate and not self._motion_gate.should_detect(
+            frame, self._face_count
+        ):
+            # Static scene and nobody there last time: keep the "no faces" result
+            DETECTIONS_SKIPPED.inc()
+            return [], False
 
-        try:
-            faces = self._detect_faces(frame)
-            return True, len(faces), None
-        except Exception as e:
-            return False, 0, str(e)
+        return self._detect_faces(frame), True
+
+    def process_frame(self, frame, captured_at: float) -> list[Face]:
+        """
+        Detect faces in a frame and feed the result through presence debouncing.
+
+        This is the synchronous core of the detection loop, usable without a
+        camera or event loop (see replay.py).
+
+        Args:
+            frame: BGR image
+            captured_at: When the frame was captured (seconds)
+
+        Returns:
+            List of detected faces
+        """
+        faces, _ = self.detect_frame(frame)
+        self._record_detection(faces, captured_at)
+        return faces
+
+    def _record_detection(self, faces: list[Face], captured_at: float):
+        """Update face count and debounced presence from one successful detection."""
+        self._face_count = len(faces)
+        self._error = None
+        self._present = self._debouncer.update(self._face_count, captured_at)
+
+    def load_pipeline(self):
+        """Load the detection backend, tracker and motion gate (no camera)."""
+        self._backend = create_backend(self.backend_name, self.model_path, self.profile)
+        if self.tracking:
+            self._tracker = FaceTracker(self._backend)
+        if self.motion_gate:
+            self._motion_gate = MotionGate()
 
     async def start(self):
         """Start the face detection loop."""
@@ -155,29 +320,30 @@ class FaceDetector:
             self._last_update = datetime.now(timezone.utc)
             return
 
-        # Initialize the webcam
-        self._cap = cv2.VideoCapture(self.camera_index)
+        # Initialize the webcam (or a recorded video / frame directory)
+        self._cap = open_capture(self.camera_index)
         if not self._cap.isOpened():
             raise RuntimeError(f"Could not open camera {self.camera_index}")
 
-        # Load the Haar Cascade for face detection
-        cascade_path = find_cascade_file("haarcascade_frontalface_default.xml")
-        if not cascade_path:
+        # Load the configured detection backend
+        try:
+            self.load_pipeline()
+        except (RuntimeError, ValueError):
             self._cap.release()
             self._cap = None
-            raise RuntimeError(
-                "Could not find face detection cascade file in common locations"
-            )
+            raise
 
-        self._face_cascade = cv2.CascadeClassifier(cascade_path)
-
-        if self._face_cascade.empty():
+        # Drain the camera on its own thread so detection always sees a fresh frame
+        self._grabber = FrameGrabber(self._cap)
+        try:
+            self._grabber.start()
+        except RuntimeError:
             self._cap.release()
             self._cap = None
-            raise RuntimeError(
-                f"Could not load face detection cascade from {cascade_path}"
-            )
+            self._grabber = None
+            raise
 
+        self._last_seq = 0
         self._running = True
         self._task = asyncio.create_task(self._detection_loop())
 
@@ -193,11 +359,18 @@ class FaceDetector:
                 pass
             self._task = None
 
+        # Stop the grab thread before releasing the camera it is reading from
+        if self._grabber:
+            self._grabber.stop()
+            self._grabber = None
+
         if self._cap:
             self._cap.release()
             self._cap = None
 
-        self._face_cascade = None
+        self._backend = None
+        self._tracker = None
+        self._motion_gate = None
 
     async def _detection_loop(self):
         """Main detection loop that runs continuously."""
@@ -205,58 +378,73 @@ class FaceDetector:
 
         while self._running:
             start_time = time.time()
-            current_time = time.time()
 
             # Run detection in thread pool to avoid blocking
-            success, face_count, error = await loop.run_in_executor(
-                None, self._capture_and_detect
-            )
+            (
+                success,
+                faces,
+                error,
+                current_time,
+                detect_seconds,
+            ) = await loop.run_in_executor(None, self._capture_and_detect)
 
             # Update state
             if success:
-                self._face_count = face_count
-                self._error = None
-
                 # Debounce presence logic
-                if face_count > 0:
-                    # Faces detected
-                    if self._faces_detected_since is None:
-                        # Start tracking continuous detection
-                        self._faces_detected_since = current_time
-
-                    # Reset the "no faces" timer
-                    self._no_faces_since = None
-
-                    # Check if faces have been detected long enough
-                    if not self._present:
-                        detection_duration = current_time - self._faces_detected_since
-                        if detection_duration >= self.present_delay:
-                            self._present = True
-                else:
-                    # No faces detected
-                    if self._no_faces_since is None:
-                        # Start tracking time with no faces
-                        self._no_faces_since = current_time
-
-                    # Reset the "faces detected" timer
-                    self._faces_detected_since = None
-
-                    # Check if enough time has passed without faces
-                    if self._present:
-                        no_face_duration = current_time - self._no_faces_since
-                        if no_face_duration >= self.absent_delay:
-                            self._present = False
+                self._record_detection(faces, current_time)
+                await self._publish_faces(faces, current_time)
             else:
                 self._error = error
 
             self._last_update = datetime.now(timezone.utc)
+            self._last_update_monotonic = time.monotonic()
+            await self._publish_status()
 
             # Sleep for remaining interval time
             elapsed = time.time() - start_time
-            sleep_time = max(0, self.interval - elapsed)
+            interval = self.interval
+            if self._scheduler:
+                interval = self._scheduler.next_interval(
+                    face_count=self._face_count,
+                    present=self._present,
+                    transitioning=self._debouncer.transitioning,
+                    detect_seconds=detect_seconds,
+                    motion=self._motion_gate.motion if self._motion_gate else None,
+                )
+            DETECTION_INTERVAL.set(interval)
+            sleep_time = max(0, interval - elapsed)
             if sleep_time > 0:
                 await asyncio.sleep(sleep_time)
 
+    async def _publish_status(self):
+        """Publish the current status to subscribers if its state changed."""
+        status = self.get_status()
+        state = {field: status[field] for field in STATE_FIELDS}
+        if state != self._last_published_state:
+            self._last_published_state = state
+            await self.updates.publish(status)
+
+    async def _publish_faces(self, faces: list[Face], captured_at: float):
+        """Publish the boxes from one detection to face-stream subscribers."""
+        width, height = self._frame_size or (0, 0)
+        await self.face_updates.publish(
+            {
+                "timestamp": captured_at,
+                "width": width,
+                "height": height,
+                "faces": [
+                    {
+                        "x": face.x,
+                        "y": face.y,
+                        "w": face.w,
+                        "h": face.h,
+                        "score": round(face.score, 3),
+                    }
+                    for face in faces
+                ],
+            }
+        )
+
     def get_status(self) -> dict:
         """
         Get current detection status.
@@ -269,12 +457,22 @@ class FaceDetector:
             "present": self._present,
             "face_count": self._face_count,
             "last_update": self._last_update.isoformat() if self._last_update else None,
+            "last_update_monotonic": self._last_update_monotonic,
             "error": self._error,
             "camera_index": self.camera_index,
+            "backend": self._backend.cost() if self._backend else None,
+            "tracking": self._tracker.stats() if self._tracker else None,
+            "motion_gate": self._motion_gate.stats() if self._motion_gate else None,
+            "interval": self._scheduler.interval if self._scheduler else self.interval,
         }
 
 
-def show_camera_preview(camera_index: int = 0, window_title: str = "Camera Preview"):
+def show_camera_preview(
+    camera_index: int = 0,
+    window_title: str = "Camera Preview",
+    backend: str = "haar",
+    model_path: Optional[str] = None,
+):
     """
     Show a live camera preview window with face detection.
 
@@ -284,6 +482,8 @@ def show_camera_preview(camera_index: int = 0, window_title: str = "Camera Previ
     Args:
         camera_index: Camera device index (default: 0)
         window_title: Title for the preview window (default: "Camera Preview")
+        backend: Detection backend name (default: haar)
+        model_path: Local model file for the backend (default: backend search)
 
     Returns:
         0 on success, 1 on error
@@ -302,23 +502,11 @@ def show_camera_preview(camera_index: int = 0, window_title: str = "Camera Previ
         print(f"Error: Could not open camera {camera_index}", file=sys.stderr)
         return 1
 
-    # Load the Haar Cascade for face detection
-    cascade_path = find_cascade_file("haarcascade_frontalface_default.xml")
-    if not cascade_path:
-        print(
-            "Error: Could not find face detection cascade file in common locations",
-            file=sys.stderr,
-        )
-        cap.release()
-        return 1
-
-    face_cascade = cv2.CascadeClassifier(cascade_path)
-
-    if face_cascade.empty():
-        print(
-            f"Error: Could not load face detection cascade from {cascade_path}",
-            file=sys.stderr,
-        )
+    # Load the detection backend
+    try:
+        detection_backend = create_backend(backend, model_path)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
         cap.release()
         return 1
 
@@ -334,14 +522,17 @@ def show_camera_preview(camera_index: int = 0, window_title: str = "Camera Previ
                 break
 
             # Detect faces
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = face_cascade.detectMultiScale(
-                gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
-            )
+            faces = detection_backend.detect(frame)
 
             # Draw rectangles around faces
-            for x, y, w, h in faces:
-                cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+            for face in faces:
+                cv2.rectangle(
+                    frame,
+                    (face.x, face.y),
+                    (face.x + face.w, face.y + face.h),
+                    (0, 255, 0),
+                    2,
+                )
 
             # Display the frame
             cv2.imshow(window_title, frame)
@@ -376,11 +567,22 @@ if __name__ == "__main__":
         action="store_true",
         help="Show camera preview (for compatibility with face_detector.py)",
     )
+    parser.add_argument(
+        "--backend",
+        default="haar",
+        help="Detection backend: haar, lbp, yunet or ssd (default: haar)",
+    )
+    parser.add_argument(
+        "--model", default=None, help="Local model file for the detection backend"
+    )
 
     args = parser.parse_args()
 
     sys.exit(
         show_camera_preview(
-            camera_index=args.camera, window_title="Squobert Camera Preview"
+            camera_index=args.camera,
+            window_title="Squobert Camera Preview",
+            backend=args.backend,
+            model_path=args.model,
         )
     )
@@ -0,0 +1,87 @@
+"""
+Async publish/subscribe channel for presence status updates.
+
+The detector publishes whenever its status changes and subscribers wake up
+only then, instead of polling. The channel holds just the latest value with a
+version number, so a slow subscriber skips stale intermediate states rather
+than building up a backlog.
+"""
+
+import asyncio
+from typing import Any, Optional
+
+
+class StatusChannel:
+    """
+    Latest-value broadcast channel built on asyncio.Condition.
+    """
+
+    def __init__(self):
+        self._condition = asyncio.Condition()
+        self._value: Any = None
+        self._version = 0
+
+    @property
+    def value(self) -> Any:
+        """The most recently published value (None before the first publish)."""
+        return self._value
+
+    @property
+    def version(self) -> int:
+        """Number of values published so far."""
+        return self._version
+
+    async def publish(self, value: Any):
+        """
+        Publish a new value and wake every waiting subscriber.
+
+        Args:
+            value: The new status
+        """
+        async with self._condition:
+            self._value = value
+            self._version += 1
+            self._condition.notify_all()
+
+    def subscribe(self) -> "Subscription":
+        """
+        Create a subscription that yields values published from now on.
+
+        Returns:
+            A new Subscription
+        """
+        return Subscription(self)
+
+
+class Subscription:
+    """
+    One subscriber's view of a StatusChannel.
+    """
+
+    def __init__(self, channel: StatusChannel):
+        self._channel = channel
+        self._seen_version = channel.version
+
+    async def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for a value newer than the last one this subscriber saw.
+
+        Args:
+            timeout: Maximum seconds to wait (default: wait forever)
+
+        Returns:
+            The latest published value
+
+        Raises:
+            asyncio.TimeoutError: If nothing new was published within the timeout
+        """
+        channel = self._channel
+        async with channel._condition:
+            await asyncio.wait_for(
+                channel._condition.wait_for(
+                    lambda: channel._version > self._seen_version
+                ),
+                timeout,
+            )
+            self._seen_version = channel._version
+            return channel._value
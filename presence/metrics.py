@@ -0,0 +1,299 @@
+"""
+Operational metrics for the presence service in Prometheus text format.
+
+A deliberately small, dependency-free take on the Prometheus client: counters,
+gauges and fixed-bucket histograms that cost a lock and a few additions per
+observation, rendered by the /metrics endpoint. Metric objects are safe to
+update from the detection thread and the event loop alike.
+"""
+
+import asyncio
+import bisect
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+
+# Raspberry Pi (and most Linux SBCs) expose the SoC temperature here
+THERMAL_ZONE = Path("/sys/class/thermal/thermal_zone0/temp")
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Base class: one time series with a fixed name and label set."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Optional[dict] = None):
+        self.name = name
+        self.help = help
+        self.labels = labels or {}
+        self._lock = threading.Lock()
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        """Return (sample name, labels, value) rows for rendering."""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Optional[dict] = None):
+        super().__init__(name, help, labels)
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def samples(self):
+        return [(self.name, self.labels, self._value)]
+
+
+class Gauge(Metric):
+    """A value that goes up and down, either set directly or read from a callback."""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Optional[dict] = None,
+        function: Optional[Callable[[], Optional[float]]] = None,
+    ):
+        super().__init__(name, help, labels)
+        self._value = 0.0
+        self._function = function
+
+    def set(self, value: float):
+        self._value = value
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._function() if self._function else self._value
+
+    def samples(self):
+        value = self.value
+        return [] if value is None else [(self.name, self.labels, value)]
+
+
+class Histogram(Metric):
+    """Distribution of observations over fixed cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        buckets: tuple = LATENCY_BUCKETS,
+        labels: Optional[dict] = None,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def samples(self):
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        rows = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+            cumulative += bucket_count
+            labels = {**self.labels, "le": _format_value(bound)}
+            rows.append((f"{self.name}_bucket", labels, cumulative))
+        rows.append((f"{self.name}_sum", self.labels, total))
+        rows.append((f"{self.name}_count", self.labels, count))
+        return rows
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics: list[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add a metric, unless one with the same name and labels is registered.
+
+        Returns:
+            The registered metric: the existing one if there was a match, so a
+            module imported twice does not render every series twice
+        """
+        for existing in self._metrics:
+            if existing.name == metric.name and existing.labels == metric.labels:
+                return existing
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labels: Optional[dict] = None) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        labels: Optional[dict] = None,
+        function: Optional[Callable[[], Optional[float]]] = None,
+    ) -> Gauge:
+        gauge = self.register(Gauge(name, help, labels, function))
+        if function:
+            # Read from the latest registration's state
+            gauge._function = function
+        return gauge
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        buckets: tuple = LATENCY_BUCKETS,
+        labels: Optional[dict] = None,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, buckets, labels))
+
+    def render(self) -> str:
+        """
+        Render every metric.
+
+        Returns:
+            Text exposition format (version 0.0.4)
+        """
+        # Series sharing a name (different labels) must be rendered together
+        families: dict[str, list[Metric]] = {}
+        for metric in self._metrics:
+            families.setdefault(metric.name, []).append(metric)
+
+        lines = []
+        for name, metrics in families.items():
+            lines.append(f"# HELP {name} {metrics[0].help}")
+            lines.append(f"# TYPE {name} {metrics[0].type}")
+            for metric in metrics:
+                for sample, labels, value in metric.samples():
+                    lines.append(
+                        f"{sample}{_format_labels(labels)} {_format_value(value)}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+def read_cpu_temperature() -> Optional[float]:
+    """SoC temperature in degrees Celsius, or None where it is not exposed."""
+    try:
+        return int(THERMAL_ZONE.read_text()) / 1000.0
+    except (OSError, ValueError):
+        return None
+
+
+REGISTRY = MetricsRegistry()
+
+# Detection pipeline
+CAPTURE_AGE = REGISTRY.histogram(
+    "presence_capture_age_seconds",
+    "Age of the camera frame when detection started on it",
+)
+DETECTION_SECONDS = REGISTRY.histogram(
+    "presence_detection_seconds",
+    "Time spent in the detection pipeline per scanned frame",
+)
+DETECTIONS = REGISTRY.counter(
+    "presence_detections_total", "Frames scanned by the tracker or backend"
+)
+DETECTIONS_SKIPPED = REGISTRY.counter(
+    "presence_detections_skipped_total",
+    "Frames the motion gate passed over without a detector scan",
+)
+FRAMES_SUPERSEDED = REGISTRY.counter(
+    "presence_frames_superseded_total",
+    "Captured frames replaced by a newer one before detection looked at them",
+)
+CAPTURE_FAILURES = REGISTRY.counter(
+    "presence_capture_failures_total", "Detection cycles with no usable frame"
+)
+DETECTION_INTERVAL = REGISTRY.gauge(
+    "presence_detection_interval_seconds", "Current delay between detections"
+)
+CPU_TEMPERATURE = REGISTRY.gauge(
+    "presence_cpu_temperature_celsius",
+    "SoC temperature (absent where the platform does not expose it)",
+    function=read_cpu_temperature,
+)
+
+# Broadcast
+FANOUT_SECONDS = REGISTRY.histogram(
+    "presence_fanout_seconds",
+    "Time to serialise and queue one message for every client",
+    buckets=FAST_BUCKETS,
+    labels={"channel": "status"},
+)
+FACES_FANOUT_SECONDS = REGISTRY.histogram(
+    "presence_fanout_seconds",
+    "Time to serialise and queue one message for every client",
+    buckets=FAST_BUCKETS,
+    labels={"channel": "faces"},
+)
+SEND_FAILURES = REGISTRY.counter(
+    "presence_send_failures_total", "WebSocket sends that failed and closed the client"
+)
+RESYNCS = REGISTRY.counter(
+    "presence_client_resyncs_total",
+    "Times a slow client's backlog was replaced by a full-status resync",
+)
+
+# Event loop
+LOOP_LAG = REGISTRY.histogram(
+    "presence_event_loop_lag_seconds",
+    "How late the event loop ran a timer that should have fired immediately",
+    buckets=FAST_BUCKETS + (0.25, 0.5, 1.0),
+)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5):
+    """
+    Measure event-loop lag until cancelled.
+
+    Sleeps for a fixed interval and records how much later than requested it
+    woke up; a loop blocked by slow work shows up as large lag.
+
+    Args:
+        interval: Seconds between measurements
+    """
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        LOOP_LAG.observe(max(0.0, time.perf_counter() - start - interval))
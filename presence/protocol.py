@@ -0,0 +1,157 @@
+"""
+Wire encodings for presence WebSocket messages.
+
+JSON is the default. Clients can negotiate a compact fixed-size binary
+encoding instead, either with the "presence.binary.v1" WebSocket subprotocol
+or with an "?encoding=binary" query parameter.
+
+Binary messages are 16 bytes, little-endian, and always carry the full state
+(so binary clients never need to merge deltas):
+
+    offset  size  field
+    0       1     message type (0 = status, 1 = delta, 2 = heartbeat)
+    1       1     flags (bit 0 = available, bit 1 = present, bit 2 = error)
+    2       2     face count (uint16)
+    4       1     error code (see ERROR_CODES, 0 = none)
+    5       3     reserved (zero)
+    8       8     last update, monotonic seconds on the server (float64)
+
+Face stream messages (/ws/faces) are a 16-byte header followed by 12 bytes
+per face:
+
+    offset  size  field
+    0       1     message type (3 = faces)
+    1       1     reserved (zero)
+    2       2     face count (uint16)
+    4       2     frame width (uint16)
+    6       2     frame height (uint16)
+    8       8     frame capture time, Unix seconds (float64)
+    then per face: x, y, w, h (uint16 each) and score (float32)
+"""
+
+import json
+import struct
+from typing import Optional, Union
+
+from fastapi import WebSocket
+
+BINARY_SUBPROTOCOL = "presence.binary.v1"
+
+JSON = "json"
+BINARY = "binary"
+
+MESSAGE_TYPES = {"status": 0, "delta": 1, "heartbeat": 2, "faces": 3}
+
+# Known detector errors; anything else is sent as 255
+ERROR_CODES = {
+    "OpenCV (cv2) is not available": 1,
+    "Detector not initialized": 2,
+    "Failed to capture frame": 3,
+}
+UNKNOWN_ERROR = 255
+
+_BINARY_FORMAT = struct.Struct("<BBHB3xd")
+_FACES_HEADER_FORMAT = struct.Struct("<BxHHHd")
+_FACE_FORMAT = struct.Struct("<HHHHf")
+
+FLAG_AVAILABLE = 0x01
+FLAG_PRESENT = 0x02
+FLAG_ERROR = 0x04
+
+
+def negotiate_encoding(websocket: WebSocket) -> tuple[str, Optional[str]]:
+    """
+    Pick the encoding a connecting client asked for.
+
+    Args:
+        websocket: The not-yet-accepted WebSocket
+
+    Returns:
+        Tuple of (encoding, subprotocol to accept with or None)
+    """
+    if BINARY_SUBPROTOCOL in websocket.scope.get("subprotocols", []):
+        return BINARY, BINARY_SUBPROTOCOL
+    if websocket.query_params.get("encoding") == BINARY:
+        return BINARY, None
+    return JSON, None
+
+
+def encode_binary(message_type: str, status: dict) -> bytes:
+    """
+    Encode a status as a fixed-size binary message.
+
+    Args:
+        message_type: "status", "delta" or "heartbeat"
+        status: Full detector status from get_status()
+
+    Returns:
+        16-byte message
+    """
+    error = status.get("error")
+    flags = (
+        (FLAG_AVAILABLE if status.get("available") else 0)
+        | (FLAG_PRESENT if status.get("present") else 0)
+        | (FLAG_ERROR if error else 0)
+    )
+    error_code = ERROR_CODES.get(error, UNKNOWN_ERROR) if error else 0
+
+    return _BINARY_FORMAT.pack(
+        MESSAGE_TYPES[message_type],
+        flags,
+        min(status.get("face_count", 0), 0xFFFF),
+        error_code,
+        status.get("last_update_monotonic") or 0.0,
+    )
+
+
+def encode(
+    encoding: str, message_type: str, status: dict, fields: Optional[dict] = None
+) -> Union[str, bytes]:
+    """
+    Encode a presence message.
+
+    Args:
+        encoding: JSON or BINARY
+        message_type: "status", "delta" or "heartbeat"
+        status: Full detector status from get_status()
+        fields: JSON payload fields (default: the full status)
+
+    Returns:
+        Serialised message (str for JSON, bytes for binary)
+    """
+    if encoding == BINARY:
+        return encode_binary(message_type, status)
+    return json.dumps({"type": message_type, **(status if fields is None else fields)})
+
+
+def encode_faces(encoding: str, update: dict) -> Union[str, bytes]:
+    """
+    Encode a face stream message.
+
+    Args:
+        encoding: JSON or BINARY
+        update: Face update from FaceDetector.face_updates
+
+    Returns:
+        Serialised message (str for JSON, bytes for binary)
+    """
+    if encoding != BINARY:
+        return json.dumps({"type": "faces", **update})
+
+    faces = update["faces"]
+    parts = [
+        _FACES_HEADER_FORMAT.pack(
+            MESSAGE_TYPES["faces"],
+            min(len(faces), 0xFFFF),
+            update["width"],
+            update["height"],
+            update["timestamp"],
+        )
+    ]
+    parts.extend(
+        _FACE_FORMAT.pack(
+            max(0, face["x"]), max(0, face["y"]), face["w"], face["h"], face["score"]
+        )
+        for face in faces[:0xFFFF]
+    )
+    return b"".join(parts)
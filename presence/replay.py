@@ -0,0 +1,203 @@
+"""
+Offline replay of recorded video through the presence detection pipeline.
+
+Runs a video file or a directory of frames through the same motion gate,
+tracker, backend and presence debouncing as the live service, as fast as the
+CPU allows, with no camera, server or sleeps. Timing comes from the recording
+itself (frame index / FPS), so results are repeatable and comparable across
+backends and settings.
+
+Output is JSON lines on stdout: one "transition" line per presence change
+(and one "frame" line per detection with --frames), then a "summary" line.
+
+Usage:
+    python replay.py recording.mp4 --backend yunet --tracking
+    python replay.py frames/ --fps 5 --interval 0 --frames
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from capture import ImageDirectorySource, open_capture
+from detector import FaceDetector
+
+from facedetect import BACKENDS, CV2_AVAILABLE, PROFILES
+
+if CV2_AVAILABLE:
+    import cv2
+
+
+def replay(
+    detector: FaceDetector,
+    capture,
+    interval: float = 1.0,
+    fps: float = None,
+    emit_frames: bool = False,
+    out=sys.stdout,
+) -> dict:
+    """
+    Replay a capture through a detector's pipeline.
+
+    Args:
+        detector: FaceDetector whose pipeline has been loaded (load_pipeline())
+        capture: Opened capture from open_capture()
+        interval: Seconds of recording time between detections (0 = every frame)
+        fps: Frame rate of the recording (default: read from the capture)
+        emit_frames: Also write a JSON line per detection
+        out: Where to write JSON lines
+
+    Returns:
+        Summary dictionary (also written as the last JSON line)
+    """
+    fps = fps or capture.get(cv2.CAP_PROP_FPS) or 30.0
+
+    frames_read = 0
+    detections = 0
+    transitions = 0
+    detect_seconds = 0.0
+    next_detection_at = 0.0
+    present = False
+
+    started = time.perf_counter()
+    while True:
+        timestamp = frames_read / fps
+        if timestamp < next_detection_at:
+            # Not due yet: advance without decoding
+            if not capture.grab():
+                break
+            frames_read += 1
+            continue
+
+        ret, frame = capture.read()
+        if not ret or frame is None:
+            break
+        frames_read += 1
+
+        detect_start = time.perf_counter()
+        faces = detector.process_frame(frame, timestamp)
+        elapsed = time.perf_counter() - detect_start
+        detect_seconds += elapsed
+        detections += 1
+        next_detection_at = timestamp + interval
+
+        status = detector.get_status()
+        if emit_frames:
+            _emit(
+                out,
+                {
+                    "type": "frame",
+                    "frame": frames_read - 1,
+                    "t": round(timestamp, 3),
+                    "faces": len(faces),
+                    "present": status["present"],
+                    "detect_ms": round(elapsed * 1000, 2),
+                },
+            )
+        if status["present"] != present:
+            present = status["present"]
+            transitions += 1
+            _emit(
+                out,
+                {
+                    "type": "transition",
+                    "frame": frames_read - 1,
+                    "t": round(timestamp, 3),
+                    "present": present,
+                },
+            )
+
+    wall_seconds = time.perf_counter() - started
+    video_seconds = frames_read / fps
+    status = detector.get_status()
+    summary = {
+        "type": "summary",
+        "frames": frames_read,
+        "detections": detections,
+        "transitions": transitions,
+        "present": status["present"],
+        "video_seconds": round(video_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "realtime_factor": round(video_seconds / wall_seconds, 2)
+        if wall_seconds
+        else None,
+        "avg_detect_ms": round(detect_seconds / detections * 1000, 2)
+        if detections
+        else None,
+        "backend": status["backend"],
+        "tracking": status["tracking"],
+        "motion_gate": status["motion_gate"],
+    }
+    _emit(out, summary)
+    return summary
+
+
+def _emit(out, record: dict):
+    out.write(json.dumps(record) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded video or frame directory through presence detection"
+    )
+    parser.add_argument("source", help="Video file or directory of frames")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds of recording time between detections, 0 for every frame (default: 1.0)",
+    )
+    parser.add_argument(
+        "--fps",
+        type=float,
+        default=None,
+        help="Frame rate of the recording (default: from the file, 1.0 for directories)",
+    )
+    parser.add_argument("--present-delay", type=float, default=5.0)
+    parser.add_argument("--absent-delay", type=float, default=5.0)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="haar")
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default=None)
+    parser.add_argument("--tracking", action="store_true")
+    parser.add_argument("--motion-gate", action="store_true")
+    parser.add_argument(
+        "--frames", action="store_true", help="Print a JSON line for every detection"
+    )
+    args = parser.parse_args()
+
+    if not CV2_AVAILABLE:
+        print("Error: OpenCV (cv2) is not available", file=sys.stderr)
+        return 1
+
+    capture = open_capture(args.source)
+    if not capture.isOpened():
+        print(f"Error: Could not open {args.source}", file=sys.stderr)
+        return 1
+    if isinstance(capture, ImageDirectorySource) and args.fps:
+        capture.fps = args.fps
+
+    detector = FaceDetector(
+        camera_index=args.source,
+        interval=args.interval,
+        present_delay=args.present_delay,
+        absent_delay=args.absent_delay,
+        backend=args.backend,
+        model_path=args.model_path,
+        profile=args.profile,
+        tracking=args.tracking,
+        motion_gate=args.motion_gate,
+    )
+    try:
+        detector.load_pipeline()
+        replay(detector, capture, args.interval, args.fps, args.frames)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        capture.release()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
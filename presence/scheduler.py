@@ -0,0 +1,90 @@
+"""
+Adaptive detection interval scheduling for presence detection service.
+
+A fixed interval either wastes CPU all day in an empty room or makes session
+start feel sluggish. AdaptiveScheduler backs the interval off while nobody is
+around and snaps back to a short interval as soon as there is motion, a face,
+or a presence transition in progress, while never letting detection use more
+than a set share of a CPU core.
+"""
+
+from typing import Optional
+
+
+class AdaptiveScheduler:
+    """
+    Picks the delay before the next detection cycle.
+    """
+
+    def __init__(
+        self,
+        base_interval: float = 1.0,
+        min_interval: float = 0.25,
+        max_interval: float = 5.0,
+        backoff: float = 1.5,
+        cpu_budget: float = 0.5,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            base_interval: Interval while someone is steadily present
+            min_interval: Interval while presence is changing (motion, new faces)
+            max_interval: Longest interval during sustained absence
+            backoff: Factor the interval grows by per idle cycle
+            cpu_budget: Maximum fraction of one core detection may use (0-1]
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.base_interval = min(max(base_interval, min_interval), self.max_interval)
+        self.backoff = backoff
+        self.cpu_budget = cpu_budget
+
+        self._interval = self.base_interval
+        self._avg_detect_seconds = 0.0
+
+    @property
+    def interval(self) -> float:
+        """The most recently chosen interval in seconds."""
+        return self._interval
+
+    def next_interval(
+        self,
+        face_count: int,
+        present: bool,
+        transitioning: bool,
+        detect_seconds: float,
+        motion: Optional[bool] = None,
+    ) -> float:
+        """
+        Choose the interval before the next detection.
+
+        Args:
+            face_count: Faces found by the detection that just ran
+            present: Current debounced presence state
+            transitioning: True while a present/absent debounce timer is running
+            detect_seconds: How long the detection that just ran took
+            motion: Whether the motion gate saw motion (None if unknown)
+
+        Returns:
+            Seconds to wait before the next detection
+        """
+        if transitioning or motion or (face_count > 0 and not present):
+            # Something is changing: sample fast so the debounce settles quickly
+            interval = self.min_interval
+        elif present:
+            interval = self.base_interval
+        else:
+            # Nobody around and nothing moving: back off
+            interval = max(self._interval, self.base_interval) * self.backoff
+            interval = min(self.max_interval, interval)
+
+        # Keep detection within its share of a core, whatever the state
+        self._avg_detect_seconds = (
+            0.8 * self._avg_detect_seconds + 0.2 * detect_seconds
+        )
+        if self.cpu_budget > 0:
+            interval = max(interval, self._avg_detect_seconds / self.cpu_budget)
+
+        self._interval = interval
+        return interval
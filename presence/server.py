@@ -7,25 +7,70 @@ to connected WebSocket clients.
 
 import asyncio
 import os
+import time
 from contextlib import asynccontextmanager
-from typing import Set
+from typing import Callable, Dict, Optional, Union
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from loguru import logger
 
-from detector import FaceDetector
+from clients import ClientSender
+from detector import STATE_FIELDS, FaceDetector
+from metrics import (
+    FACES_FANOUT_SECONDS,
+    FANOUT_SECONDS,
+    REGISTRY,
+    monitor_event_loop_lag,
+)
+from protocol import encode, encode_faces, negotiate_encoding
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a true/false environment variable."""
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
+def env_float(name: str) -> Optional[float]:
+    """Read an optional float environment variable (unset or empty means None)."""
+    value = os.getenv(name)
+    return float(value) if value else None
+
 
 # Configuration from environment variables
 CAMERA_INDEX = int(os.getenv("CAMERA_INDEX", "0"))
 DETECTION_INTERVAL = float(os.getenv("DETECTION_INTERVAL", "1.0"))
+DETECTION_BACKEND = os.getenv("DETECTION_BACKEND", "haar")
+DETECTION_MODEL_PATH = os.getenv("DETECTION_MODEL_PATH") or None
+DETECTION_PROFILE = os.getenv("DETECTION_PROFILE") or None
+DETECTION_TRACKING = env_flag("DETECTION_TRACKING")
+DETECTION_MOTION_GATE = env_flag("DETECTION_MOTION_GATE")
+DETECTION_MIN_INTERVAL = env_float("DETECTION_MIN_INTERVAL")
+DETECTION_MAX_INTERVAL = env_float("DETECTION_MAX_INTERVAL")
+DETECTION_CPU_BUDGET = float(os.getenv("DETECTION_CPU_BUDGET", "0.5"))
+HEARTBEAT_INTERVAL = float(os.getenv("HEARTBEAT_INTERVAL", "10.0"))
+FACES_MAX_RATE = float(os.getenv("FACES_MAX_RATE", "10.0"))
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8765"))
 
 # Global detector instance
 detector: FaceDetector = None
-connected_clients: Set[WebSocket] = set()
+connected_clients: Dict[WebSocket, ClientSender] = {}
+face_clients: Dict[WebSocket, ClientSender] = {}
+
+REGISTRY.gauge(
+    "presence_connected_clients",
+    "Open WebSocket connections",
+    labels={"channel": "status"},
+    function=lambda: len(connected_clients),
+)
+REGISTRY.gauge(
+    "presence_connected_clients",
+    "Open WebSocket connections",
+    labels={"channel": "faces"},
+    function=lambda: len(face_clients),
+)
 
 
 @asynccontextmanager
@@ -35,9 +80,21 @@ async def lifespan(app: FastAPI):
 
     # Startup
     logger.info(
-        f"Starting presence detector (camera={CAMERA_INDEX}, interval={DETECTION_INTERVAL}s)"
+        f"Starting presence detector (camera={CAMERA_INDEX}, interval={DETECTION_INTERVAL}s, "
+        f"backend={DETECTION_BACKEND})"
+    )
+    detector = FaceDetector(
+        camera_index=CAMERA_INDEX,
+        interval=DETECTION_INTERVAL,
+        backend=DETECTION_BACKEND,
+        model_path=DETECTION_MODEL_PATH,
+        profile=DETECTION_PROFILE,
+        tracking=DETECTION_TRACKING,
+        motion_gate=DETECTION_MOTION_GATE,
+        min_interval=DETECTION_MIN_INTERVAL,
+        max_interval=DETECTION_MAX_INTERVAL,
+        cpu_budget=DETECTION_CPU_BUDGET,
     )
-    detector = FaceDetector(camera_index=CAMERA_INDEX, interval=DETECTION_INTERVAL)
 
     try:
         await detector.start()
@@ -46,18 +103,23 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to start detector: {e}")
         raise
 
-    # Background task to broadcast updates
-    broadcast_task = asyncio.create_task(broadcast_presence_updates())
+    # Background tasks to broadcast updates
+    broadcast_tasks = [
+        asyncio.create_task(broadcast_presence_updates()),
+        asyncio.create_task(broadcast_face_updates()),
+        asyncio.create_task(monitor_event_loop_lag()),
+    ]
 
     yield
 
     # Shutdown
     logger.info("Shutting down presence detector")
-    broadcast_task.cancel()
-    try:
-        await broadcast_task
-    except asyncio.CancelledError:
-        pass
+    for task in broadcast_tasks:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
     await detector.stop()
     logger.info("Presence detector stopped")
@@ -80,40 +142,114 @@ app.add_middleware(
 )
 
 
+def status_message(encoding: str) -> Union[str, bytes]:
+    """Serialise the current full status (sent on connect and on resync)."""
+    return encode(encoding, "status", detector.get_status())
+
+
+def faces_message(encoding: str) -> Union[str, bytes]:
+    """Serialise the most recent face boxes (sent on connect and on resync)."""
+    update = detector.face_updates.value or {
+        "timestamp": 0.0,
+        "width": 0,
+        "height": 0,
+        "faces": [],
+    }
+    return encode_faces(encoding, update)
+
+
+def fan_out(message_type: str, status: dict, fields: dict, if_idle: bool = False):
+    """
+    Queue a message for every connected client.
+
+    Each encoding in use is serialised once, then handed to the clients' own
+    send tasks without waiting on any of them.
+    """
+    start = time.perf_counter()
+    messages = {}
+    for sender in list(connected_clients.values()):
+        if sender.encoding not in messages:
+            messages[sender.encoding] = encode(
+                sender.encoding, message_type, status, fields
+            )
+        sender.offer(messages[sender.encoding], if_idle=if_idle)
+    FANOUT_SECONDS.observe(time.perf_counter() - start)
+
+
 async def broadcast_presence_updates():
-    """Background task that broadcasts presence updates to all connected clients."""
-    last_status = None
+    """
+    Background task that broadcasts presence updates to all connected clients.
+
+    Clients get a full "status" message on connect, then a "delta" carrying only
+    the changed state fields whenever the presence state changes, and a small
+    "heartbeat" every HEARTBEAT_INTERVAL seconds while nothing changes.
+    """
+    subscription = detector.updates.subscribe()
+    status = detector.get_status()
+    last_state = {field: status[field] for field in STATE_FIELDS}
+    heartbeat_timeout = HEARTBEAT_INTERVAL if HEARTBEAT_INTERVAL > 0 else None
 
     while True:
         try:
-            await asyncio.sleep(0.1)  # Check for updates frequently
-
-            if not connected_clients:
+            # Sleep until the detector publishes a state change (or a heartbeat is due)
+            try:
+                current_status = await subscription.get(timeout=heartbeat_timeout)
+            except asyncio.TimeoutError:
+                if connected_clients:
+                    status = detector.get_status()
+                    fields = {"last_update": status["last_update"]}
+                    fan_out("heartbeat", status, fields, if_idle=True)
                 continue
 
-            current_status = detector.get_status()
+            delta = {
+                field: current_status[field]
+                for field in STATE_FIELDS
+                if current_status[field] != last_state[field]
+            }
+            last_state = {field: current_status[field] for field in STATE_FIELDS}
 
-            # Only broadcast if status has changed
-            if current_status != last_status:
-                last_status = current_status.copy()
+            if delta and connected_clients:
+                fields = {**delta, "last_update": current_status["last_update"]}
+                fan_out("delta", current_status, fields)
 
-                # Broadcast to all connected clients
-                disconnected = set()
-                for client in connected_clients:
-                    try:
-                        await client.send_json(current_status)
-                    except Exception as e:
-                        logger.warning(f"Failed to send to client: {e}")
-                        disconnected.add(client)
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error(f"Error in broadcast loop: {e}")
+            await asyncio.sleep(1)
+
+
+async def broadcast_face_updates():
+    """
+    Background task that streams face boxes to /ws/faces clients.
 
-                # Remove disconnected clients
-                for client in disconnected:
-                    connected_clients.discard(client)
+    Sends at most FACES_MAX_RATE messages per second. Detections that arrive
+    faster than that are coalesced: only the newest one is sent.
+    """
+    subscription = detector.face_updates.subscribe()
+    min_period = 1.0 / FACES_MAX_RATE if FACES_MAX_RATE > 0 else 0.0
+
+    while True:
+        try:
+            update = await subscription.get()
+
+            if face_clients:
+                start = time.perf_counter()
+                messages = {}
+                for sender in list(face_clients.values()):
+                    encoding = sender.encoding
+                    if encoding not in messages:
+                        messages[encoding] = encode_faces(encoding, update)
+                    sender.offer(messages[encoding])
+                FACES_FANOUT_SECONDS.observe(time.perf_counter() - start)
+
+            # Anything published meanwhile collapses into the next get()
+            await asyncio.sleep(min_period)
 
         except asyncio.CancelledError:
             break
         except Exception as e:
-            logger.error(f"Error in broadcast loop: {e}")
+            logger.error(f"Error in face broadcast loop: {e}")
             await asyncio.sleep(1)
 
 
@@ -123,7 +259,12 @@ async def root():
     return {
         "service": "Presence Detection Service",
         "version": "1.0.0",
-        "endpoints": {"status": "/status", "websocket": "/ws"},
+        "endpoints": {
+            "status": "/status",
+            "websocket": "/ws",
+            "faces": "/ws/faces",
+            "metrics": "/metrics",
+        },
     }
 
 
@@ -143,19 +284,42 @@ async def get_status():
     return status
 
 
-@app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time presence updates."""
+async def serve_client(
+    websocket: WebSocket,
+    clients: Dict[WebSocket, ClientSender],
+    snapshot: Callable[[str], Union[str, bytes]],
+    max_pending: int,
+    latest_wins: bool = False,
+):
+    """
+    Register a WebSocket client and keep it until it disconnects.
+
+    Args:
+        websocket: The incoming WebSocket
+        clients: Registry the broadcast loop fans out to
+        snapshot: Serialises the current full state in an encoding
+        max_pending: Messages held for this client before it is resynced
+        latest_wins: Replace the backlog with the newest message instead of
+            resyncing (see ClientSender)
+    """
+    encoding, subprotocol = negotiate_encoding(websocket)
+    sender = ClientSender(
+        websocket,
+        snapshot,
+        encoding=encoding,
+        max_pending=max_pending,
+        latest_wins=latest_wins,
+    )
     try:
-        await websocket.accept()
-        connected_clients.add(websocket)
+        await websocket.accept(subprotocol=subprotocol)
 
-        logger.info(f"Client connected. Total clients: {len(connected_clients)}")
+        # Queue the initial full state; updates follow from the broadcast loop
+        logger.debug(f"Sending initial state ({encoding})")
+        sender.offer(snapshot(encoding))
 
-        # Send initial status
-        initial_status = detector.get_status()
-        logger.debug(f"Sending initial status: {initial_status}")
-        await websocket.send_json(initial_status)
+        sender.start()
+        clients[websocket] = sender
+        logger.info(f"Client connected. Total clients: {len(clients)}")
 
         # Keep connection alive and handle incoming messages
         while True:
@@ -169,8 +333,33 @@ async def websocket_endpoint(websocket: WebSocket):
     except Exception as e:
         logger.error(f"WebSocket error: {e}", exc_info=True)
     finally:
-        connected_clients.discard(websocket)
-        logger.info(f"Client disconnected. Total clients: {len(connected_clients)}")
+        clients.pop(websocket, None)
+        await sender.stop()
+        logger.info(f"Client disconnected. Total clients: {len(clients)}")
+
+
+@app.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket):
+    """
+    WebSocket endpoint for real-time presence updates.
+
+    Sends JSON by default; clients can ask for the compact binary encoding
+    with the "presence.binary.v1" subprotocol or "?encoding=binary".
+    """
+    await serve_client(websocket, connected_clients, status_message, max_pending=4)
+
+
+@app.websocket("/ws/faces")
+async def faces_websocket_endpoint(websocket: WebSocket):
+    """
+    Opt-in WebSocket stream of face boxes, sizes and scores per detection.
+
+    Rate-limited to FACES_MAX_RATE and latest-wins per client, so it never
+    competes with the /ws status channel.
+    """
+    await serve_client(
+        websocket, face_clients, faces_message, max_pending=1, latest_wins=True
+    )
 
 
 @app.get("/health")
@@ -188,8 +377,17 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Operational metrics in Prometheus text exposition format."""
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
     logger.info(f"Starting server on {HOST}:{PORT}")
-    uvicorn.run("server:app", host=HOST, port=PORT, log_level="info")
+    # Pass the app itself: "server:app" would import this module a second time
+    uvicorn.run(app, host=HOST, port=PORT, log_level="info")